@@ -0,0 +1,338 @@
+"""
+In-memory stand-in for the Supabase client used by the startup benchmarks.
+
+Supports the subset of the postgrest query builder the app uses (select
+with embedded resources, eq/lte/in_/or_ keyset filters, order, limit,
+range, insert/upsert/delete and rpc), seeded with a creator, a few forms
+and their responses so every page renders with realistic data.
+"""
+import copy
+import re
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import jwt
+
+USER_ID = '00000000-0000-4000-8000-000000000001'
+
+# Secret the fake session's access token is signed with; the benchmark
+# passes it to the app as SUPABASE_JWT_SECRET
+JWT_SECRET = 'benchmark-jwt-secret'
+
+# Transaction ids are compared as strings here, so they share one width;
+# every seeded response was inserted by a transaction below the xmin
+SEEDED_XID = '0000000100'
+SNAPSHOT_XMIN = '0000000200'
+
+# Keyset filter produced by response_service.keyset_filter
+KEYSET_PATTERN = re.compile(r'(\w+)\.(lt|gt)\."([^"]+)",and\(\w+\.eq\."[^"]+",id\.(?:lt|gt)\.(.+)\)')
+
+
+class Result:
+    def __init__(self, data):
+        self.data = data
+        self.count = None
+
+
+def split_top_level(text):
+    """
+    Split a select string on commas that are not inside parentheses
+    """
+    parts, depth, current = [], 0, ''
+    for char in text:
+        if char == ',' and depth == 0:
+            parts.append(current.strip())
+            current = ''
+            continue
+        depth += char == '('
+        depth -= char == ')'
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def foreign_key(table):
+    return f"{table[:-1]}_id"
+
+
+class Query:
+    def __init__(self, backend, table):
+        self.backend = backend
+        self.table = table
+        self.headers = {}
+        self.columns = '*'
+        self.filters = []
+        self.ordering = []
+        self.offset = 0
+        self.row_limit = None
+        self.operation = 'select'
+        self.payload = None
+
+    def select(self, columns='*', **kwargs):
+        self.columns = columns
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row[column] < value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row[column] >= value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row[column] <= value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def or_(self, expression):
+        column, op, value, row_id = KEYSET_PATTERN.match(expression).groups()
+        if op == 'gt':
+            self.filters.append(lambda row: (row[column], row['id']) > (value, row_id))
+        else:
+            self.filters.append(lambda row: (row[column], row['id']) < (value, row_id))
+        return self
+
+    def order(self, column, desc=False):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def range(self, start, end):
+        self.offset, self.row_limit = start, end - start + 1
+        return self
+
+    def insert(self, payload):
+        self.operation, self.payload = 'insert', payload
+        return self
+
+    def upsert(self, payload):
+        self.operation, self.payload = 'upsert', payload
+        return self
+
+    def delete(self):
+        self.operation = 'delete'
+        return self
+
+    def execute(self):
+        self.backend.requests += 1
+        rows = self.backend.tables.setdefault(self.table, [])
+
+        if self.operation in ('insert', 'upsert'):
+            payloads = self.payload if isinstance(self.payload, list) else [self.payload]
+            key = 'form_id' if self.table == 'form_analytics_snapshots' else 'id'
+            inserted = []
+            for payload in payloads:
+                row = {'id': str(uuid.uuid4()), 'created_at': datetime.now(timezone.utc).isoformat(), **payload}
+                rows[:] = [r for r in rows if self.operation == 'insert' or r.get(key) != row.get(key)]
+                rows.append(row)
+                inserted.append(row)
+            return Result(copy.deepcopy(inserted))
+
+        matched = [row for row in rows if all(check(row) for check in self.filters)]
+        if self.operation == 'delete':
+            rows[:] = [row for row in rows if row not in matched]
+            return Result(matched)
+
+        for column, desc in reversed(self.ordering):
+            matched.sort(key=lambda row: row.get(column) or '', reverse=desc)
+        matched = matched[self.offset:]
+        if self.row_limit is not None:
+            matched = matched[:self.row_limit]
+        return Result([self.backend.project(self.table, row, self.columns) for row in matched])
+
+
+class Rpc:
+    def __init__(self, backend, fn, params):
+        self.backend = backend
+        self.fn = fn
+        self.params = params
+        self.headers = {}
+
+    def execute(self):
+        self.backend.requests += 1
+        if self.fn == 'creator_dashboard_rollup':
+            # The fake session always belongs to USER_ID, i.e. auth.uid()
+            return Result(self.backend.dashboard_rollup(USER_ID))
+        if self.fn == 'responses_snapshot_xmin':
+            return Result(SNAPSHOT_XMIN)
+        if self.fn == 'submit_form_response':
+            return Result(str(uuid.uuid4()))
+        return Result(None)
+
+
+class FakeSupabase:
+    """
+    Minimal Supabase client backed by Python lists
+    """
+
+    def __init__(self, forms=3, questions_per_form=8, responses_per_form=200):
+        self.requests = 0
+        self.tables = {}
+        self.auth = SimpleNamespace(get_session=lambda: None)
+        self.seed(forms, questions_per_form, responses_per_form)
+
+    def table(self, name):
+        return Query(self, name)
+
+    def from_(self, name):
+        return self.table(name)
+
+    def rpc(self, fn, params=None):
+        return Rpc(self, fn, params or {})
+
+    def project(self, table, row, columns):
+        """
+        Apply a select string to a row, resolving embedded resources
+        """
+        result = {}
+        for part in split_top_level(columns):
+            match = re.match(r'(\w+)\((.*)\)$', part, re.S)
+            if not match:
+                if part == '*':
+                    result.update(row)
+                elif part in row:
+                    result[part] = row[part]
+                continue
+
+            related, inner = match.groups()
+            children = [r for r in self.tables.get(related, []) if r.get(foreign_key(table)) == row['id']]
+            if inner.strip() == 'count':
+                result[related] = [{'count': len(children)}]
+            elif children or foreign_key(related) not in row:
+                result[related] = [self.project(related, child, inner) for child in children]
+            else:
+                parent = next((r for r in self.tables.get(related, []) if r['id'] == row[foreign_key(related)]), None)
+                result[related] = self.project(related, parent, inner) if parent else None
+        return copy.deepcopy(result)
+
+    def dashboard_rollup(self, creator_id):
+        """
+        Rows shaped like the creator_dashboard_rollup database function's result
+        """
+        now = datetime.now(timezone.utc)
+        parse = lambda value: datetime.fromisoformat(value.replace('Z', '+00:00'))
+        forms = [f for f in self.tables.get('forms', []) if f['creator_id'] == creator_id]
+        form_ids = {f['id'] for f in forms}
+        responses = [r for r in self.tables.get('responses', []) if r['form_id'] in form_ids]
+
+        form_counts = []
+        for form in sorted(forms, key=lambda f: f['created_at'], reverse=True):
+            own = [r['created_at'] for r in responses if r['form_id'] == form['id']]
+            form_counts.append({
+                'form_id': form['id'], 'created_at': form['created_at'], 'is_public': form['is_public'],
+                'responses': len(own), 'last_response': max(own, key=parse) if own else None
+            })
+
+        def series(key, truncate, since=None):
+            counts = {}
+            for response in responses:
+                created = parse(response['created_at'])
+                if since is None or created >= since:
+                    bucket = truncate(created).isoformat()
+                    counts[bucket] = counts.get(bucket, 0) + 1
+            return [{key: bucket, 'responses': counts[bucket]} for bucket in sorted(counts)]
+
+        day = lambda ts: ts.replace(hour=0, minute=0, second=0, microsecond=0)
+        activity = sorted(
+            [{'time': r['created_at'], 'action': 'New response received', 'form_id': r['form_id']} for r in responses]
+            + [{'time': f['created_at'], 'action': 'Form created', 'form_id': f['id']} for f in forms],
+            key=lambda a: parse(a['time']),
+            reverse=True
+        )
+
+        return {
+            'forms': form_counts,
+            'monthly': series('month', lambda ts: day(ts).replace(day=1)),
+            'daily': series('day', day, now - timedelta(days=30)),
+            'recent_activity': activity[:10]
+        }
+
+    def seed(self, forms, questions_per_form, responses_per_form):
+        now = datetime.now(timezone.utc)
+        types = ['short_text', 'multiple_choice', 'checkbox', 'number', 'long_text', 'dropdown']
+        options = ['Excellent', 'Good', 'Average', 'Poor']
+
+        self.tables['user_info'] = [
+            {'id': USER_ID, 'first_name': 'Bench', 'last_name': 'User', 'email': 'bench@example.com'}
+        ]
+        self.tables['forms'] = []
+        self.tables['questions'] = []
+        self.tables['responses'] = []
+        self.tables['response_answers'] = []
+
+        for f in range(forms):
+            form_id = str(uuid.UUID(int=f + 1))
+            created = (now - timedelta(days=30 + f)).isoformat()
+            self.tables['forms'].append({
+                'id': form_id, 'creator_id': USER_ID, 'created_at': created,
+                'updated_at': created, 'is_public': True, 'allow_anon': True,
+                'title': f"Benchmark Form {f + 1}", 'description': 'Seeded for the startup benchmarks'
+            })
+
+            questions = []
+            for q in range(questions_per_form):
+                q_type = types[q % len(types)]
+                questions.append({
+                    'id': str(uuid.uuid4()), 'form_id': form_id, 'created_at': created,
+                    'questions_text': f"Question {q + 1}", 'question_type': q_type,
+                    'is_required': q == 0, 'order_number': q + 1,
+                    'options': options if q_type in ('multiple_choice', 'checkbox', 'dropdown') else None
+                })
+            self.tables['questions'].extend(questions)
+
+            for r in range(responses_per_form):
+                response_id = str(uuid.uuid4())
+                submitted = (now - timedelta(minutes=37 * r)).isoformat()
+                self.tables['responses'].append({
+                    'id': response_id, 'form_id': form_id, 'created_at': submitted,
+                    'is_anon': r % 3 == 0, 'respondent_id': None if r % 3 == 0 else USER_ID,
+                    'inserted_xid': SEEDED_XID
+                })
+                for q, question in enumerate(questions):
+                    answer = {
+                        'id': str(uuid.uuid4()), 'response_id': response_id, 'question_id': question['id'],
+                        'created_at': submitted, 'answer_value': None, 'checkbox_value': None
+                    }
+                    if question['question_type'] == 'checkbox':
+                        answer['checkbox_value'] = options[:1 + (r + q) % 3]
+                    elif question['question_type'] == 'number':
+                        answer['answer_value'] = str(float(r % 10))
+                    elif question['options']:
+                        answer['answer_value'] = options[(r + q) % len(options)]
+                    else:
+                        answer['answer_value'] = f"Answer {r}"
+                    self.tables['response_answers'].append(answer)
+
+
+def sign_token(claims):
+    """
+    Encode claims as an HS256 JWT signed with JWT_SECRET
+    """
+    return jwt.encode(claims, JWT_SECRET, algorithm='HS256')
+
+
+def fake_session():
+    """
+    Signed-in session object shaped like a gotrue Session
+    """
+    expires_at = int(time.time()) + 3600
+    return SimpleNamespace(
+        access_token=sign_token({'sub': USER_ID, 'aud': 'authenticated', 'role': 'authenticated', 'exp': expires_at}),
+        refresh_token='benchmark-refresh',
+        expires_at=expires_at,
+        user=SimpleNamespace(id=USER_ID, email='bench@example.com')
+    )
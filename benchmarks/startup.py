@@ -0,0 +1,232 @@
+"""
+Startup benchmarks for FlockIQ.
+
+Measures, each in a fresh interpreter:
+  - cold import time of every src.index page and src.services module
+  - cold start of main.main() (anonymous Home page) under Streamlit's
+    testing harness
+  - first render of every page for a signed-in user against an
+    in-memory fake backend
+
+Results are written as JSON so runs can be compared across commits:
+
+    python -m benchmarks.startup --output startup.json
+    python -m benchmarks.startup --baseline startup.json --output new.json
+"""
+import argparse
+import ast
+import json
+import os
+import pkgutil
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Marker for the result line a worker prints to stdout
+RESULT_PREFIX = 'BENCHMARK_RESULT '
+
+# Script run by AppTest: swap in the fake backend, then start the app
+APP_SCRIPT = """
+import benchmarks.fake_backend as fake_backend
+import src.config.supabase_client as supabase_client
+supabase_client._shared_client = fake_backend.BACKEND
+import main
+main.main()
+"""
+
+# Relative slowdown reported as a regression when comparing with a baseline
+REGRESSION_THRESHOLD = 0.10
+
+
+def discover_modules():
+    """
+    Dotted names of every page and service module
+    """
+    modules = []
+    for package in ('src.index', 'src.services'):
+        path = os.path.join(REPO_ROOT, *package.split('.'))
+        modules.extend(f"{package}.{info.name}" for info in pkgutil.iter_modules([path]))
+    return sorted(modules)
+
+
+def page_names():
+    """
+    Pages registered in main.PAGE_MODULES, read without importing main
+    """
+    with open(os.path.join(REPO_ROOT, 'main.py'), 'r', encoding='utf-8') as fileobj:
+        tree = ast.parse(fileobj.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], 'id', None) == 'PAGE_MODULES':
+            return list(ast.literal_eval(node.value).keys())
+    raise RuntimeError("PAGE_MODULES not found in main.py")
+
+
+def emit(result):
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+def worker_import(module):
+    start = time.perf_counter()
+    __import__(module)
+    emit({'seconds': time.perf_counter() - start})
+
+
+def worker_app(page, logged_in):
+    """
+    Run one AppTest script run of main for `page` and time it
+    """
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import benchmarks.fake_backend as fake_backend
+    harness_seconds = time.perf_counter() - start
+
+    fake_backend.BACKEND = fake_backend.FakeSupabase()
+    app = AppTest.from_string(APP_SCRIPT, default_timeout=120)
+    app.secrets['SUPABASE_JWT_SECRET'] = fake_backend.JWT_SECRET
+    app.secrets['METRICS_PORT'] = 0
+    app.session_state['logged_in'] = logged_in
+    app.session_state['active_page'] = page
+    if logged_in:
+        app.session_state['supabase_session'] = fake_backend.fake_session()
+
+    run_start = time.perf_counter()
+    app.run()
+    run_seconds = time.perf_counter() - run_start
+
+    emit({
+        'seconds': run_seconds,
+        'harness_seconds': harness_seconds,
+        'backend_requests': fake_backend.BACKEND.requests,
+        'exception': app.exception[0].message if app.exception else None,
+        'errors': [element.value for element in app.error]
+    })
+
+
+def run_worker(*args):
+    """
+    Run a worker in a fresh interpreter and return its result
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get('PYTHONPATH')])))
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-m', 'benchmarks.startup', '--worker', *args],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    wall_seconds = time.perf_counter() - start
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+            result['wall_seconds'] = wall_seconds
+            return result
+    return {'seconds': None, 'wall_seconds': wall_seconds, 'exception': completed.stderr.strip()[-2000:]}
+
+
+def measure(repeat, *args):
+    """
+    Run a worker `repeat` times and summarise its timings
+    """
+    runs = [run_worker(*args) for _ in range(repeat)]
+    timings = [run['seconds'] for run in runs if run.get('seconds') is not None]
+    summary = {
+        'median': statistics.median(timings) if timings else None,
+        'min': min(timings) if timings else None,
+        'wall_median': statistics.median(run['wall_seconds'] for run in runs),
+        'runs': timings
+    }
+    # Keep details (errors, request counts) from the last run
+    summary.update({key: value for key, value in runs[-1].items() if key not in ('seconds', 'wall_seconds')})
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """
+    Print metrics that got slower than the baseline by REGRESSION_THRESHOLD
+    """
+    regressions = 0
+    for section in ('imports', 'first_render'):
+        for name, current in results[section].items():
+            previous = baseline.get(section, {}).get(name)
+            if not previous or not previous.get('median') or current.get('median') is None:
+                continue
+            change = current['median'] / previous['median'] - 1
+            if change > REGRESSION_THRESHOLD:
+                regressions += 1
+                print(f"REGRESSION {section}/{name}: {previous['median']:.3f}s -> {current['median']:.3f}s ({change:+.0%})")
+
+    previous = baseline.get('cold_start', {}).get('median')
+    current = results['cold_start'].get('median')
+    if previous and current and current / previous - 1 > REGRESSION_THRESHOLD:
+        regressions += 1
+        print(f"REGRESSION cold_start: {previous:.3f}s -> {current:.3f}s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default='startup_benchmark.json', help="JSON file to write results to")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement; the median is reported")
+    parser.add_argument('--baseline', help="Earlier results file to compare against")
+    parser.add_argument('--skip-imports', action='store_true', help="Skip per-module import timings")
+    parser.add_argument('--worker', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        kind, *rest = args.worker
+        if kind == 'import':
+            worker_import(rest[0])
+        else:
+            worker_app(rest[0], kind == 'page')
+        return 0
+
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'repeat': args.repeat
+        },
+        'imports': {},
+        'cold_start': {},
+        'first_render': {}
+    }
+
+    if not args.skip_imports:
+        for module in ['streamlit', 'supabase'] + discover_modules():
+            results['imports'][module] = measure(args.repeat, 'import', module)
+            print(f"import {module}: {results['imports'][module]['median']}")
+
+    results['cold_start'] = measure(args.repeat, 'cold', 'Home')
+    print(f"cold start: {results['cold_start']['median']}")
+
+    for page in page_names():
+        results['first_render'][page] = measure(args.repeat, 'page', page)
+        print(f"render {page}: {results['first_render'][page]['median']}")
+
+    with open(args.output, 'w', encoding='utf-8') as fileobj:
+        json.dump(results, fileobj, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as fileobj:
+            return 1 if compare(results, json.load(fileobj)) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
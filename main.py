@@ -1,19 +1,7 @@
+import importlib
 import streamlit as st
 from src.services.auth_service import AuthService
-# Import page modules
-import src.index.list_forms as list_forms
-import src.index.create_form as create_form
-import src.index.my_forms as my_forms
-import src.index.fill_form as fill_form
-import src.index.my_responses as my_responses
-import src.index.form_templates as form_templates
-import src.index.form_analytics as form_analytics
-import src.index.form_dashboard as form_dashboard
-import src.index.profile as profile
-import src.index.welcome as welcome
-import src.index.home as home
-import src.index.login as login
-import src.index.signup as signup
+from src.utils.metrics import DEFAULT_METRICS_ADDR, DEFAULT_METRICS_PORT, instrument_page, start_metrics_server
 
 # Navbar setup
 NAV_CATEGORIES = {
@@ -22,26 +10,39 @@ NAV_CATEGORIES = {
     "Analytics": [ "Form Dashboard", "Form Analytics"],
 }
 
-# Page render functions
-PAGE_FUNCTIONS = {
-    "Home": home.render_page,
-    "Welcome": welcome.render_page,
-    "List Forms": list_forms.render_page,
-    "Create Form": create_form.render_page,
-    "My Forms": my_forms.render_page,
-    "Fill Form": fill_form.render_page,
-    "My Responses": my_responses.render_page,
-    "Profile": profile.render_page,
-    "Login": login.render_page,
-    "Signup": signup.render_page,
-    "Form Templates": form_templates.render_page,
-    "Form Dashboard": form_dashboard.render_page,
-    "Form Analytics": form_analytics.render_page
+# Page modules, imported the first time each page is rendered so that a
+# visitor on Home or Login does not load the analytics stack
+PAGE_MODULES = {
+    "Home": "src.index.home",
+    "Welcome": "src.index.welcome",
+    "List Forms": "src.index.list_forms",
+    "Create Form": "src.index.create_form",
+    "My Forms": "src.index.my_forms",
+    "Fill Form": "src.index.fill_form",
+    "My Responses": "src.index.my_responses",
+    "Profile": "src.index.profile",
+    "Login": "src.index.login",
+    "Signup": "src.index.signup",
+    "Form Templates": "src.index.form_templates",
+    "Form Dashboard": "src.index.form_dashboard",
+    "Form Analytics": "src.index.form_analytics"
 }
 
+def get_page_function(page):
+    """
+    Import a page's module on first use and return its render function,
+    instrumented so its render time and backend queries are labeled
+    with the page
+    """
+    # import_module returns the already-loaded module from sys.modules
+    # on later calls
+    return instrument_page(page, importlib.import_module(PAGE_MODULES[page]).render_page)
+
 def logout(auth_service):
     auth_service.sign_out()
     st.session_state.logged_in = False
+    # Drop data loaded for the previous user
+    st.session_state.pop('my_responses', None)
     st.session_state.active_page = "Home"  # Change to Home instead of Login
     st.rerun()
 
@@ -72,6 +73,12 @@ def render_navbar(auth_service):
 def main():
     # Set page configuration
     st.set_page_config(page_title="FlockIQ", layout="wide", initial_sidebar_state="collapsed")
+
+    # Expose Prometheus metrics locally; a no-op after the first run
+    start_metrics_server(
+        st.secrets.get('METRICS_PORT', DEFAULT_METRICS_PORT),
+        st.secrets.get('METRICS_ADDR', DEFAULT_METRICS_ADDR)
+    )
     
     # Initialize authentication service
     auth_service = AuthService()
@@ -100,7 +107,7 @@ def main():
             active_page = "Home"
     
     # Render the appropriate page
-    PAGE_FUNCTIONS[active_page]()
+    get_page_function(active_page)()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
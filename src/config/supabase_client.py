@@ -1,18 +1,139 @@
+import threading
 import streamlit as st
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
+from src.utils.auth_utils import current_session
+from src.utils.metrics import observe_query, watch_response_sizes
 
+# Builder methods that set a query's operation label in the metrics
+QUERY_OPERATIONS = ('select', 'insert', 'upsert', 'update', 'delete')
 
-def get_supabase_client() -> Client:
+# Process-wide client shared by every page, service and rerun
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def _create_client() -> Client:
+    """
+    Build a new Supabase client from Streamlit secrets
+
+    Clients never refresh or store sessions themselves: the signed-in
+    session lives in Streamlit state and is rotated only by
+    current_session(), since a refresh token may be used just once.
+    """
+    url = st.secrets["SUPABASE_URL"]
+    key = st.secrets["SUPABASE_KEY"]
+
+    options = ClientOptions(
+        auto_refresh_token=False,
+        persist_session=False
+    )
+    return create_client(url, key, options)
+
+
+def get_shared_client() -> Client:
+    """
+    Return the process-wide Supabase client, creating it on first use.
+
+    The underlying httpx session keeps HTTP/2 connections alive, so every
+    query after the first one reuses a warm connection. This client never
+    signs in: it always carries the anon key, and user credentials are
+    attached per request by ScopedSupabaseClient.
+    """
+    global _shared_client
+
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                client = _create_client()
+                # Record response sizes for the query metrics
+                watch_response_sizes(client.postgrest.session)
+                _shared_client = client
+    return _shared_client
+
+
+def create_auth_client() -> Client:
+    """
+    Create a dedicated client for auth flows (sign up, sign in, sign out).
+
+    Signing in mutates a client's auth state and default headers, so these
+    flows must never run against the shared client.
+    """
+    return _create_client()
+
+
+class _ScopedRequestBuilder:
+    """
+    Proxy around a postgrest request builder that stamps the user's
+    Authorization header on every builder produced by the query chain
+    and records metrics for the request when it is executed.
+    """
+
+    def __init__(self, builder, auth_header, table, operation='select'):
+        self._builder = builder
+        self._auth_header = auth_header
+        self._table = table
+        self._operation = operation
+        self._apply_auth()
+
+    def _apply_auth(self):
+        headers = getattr(self._builder, 'headers', None)
+        if self._auth_header and headers is not None:
+            headers['Authorization'] = self._auth_header
+
+    def execute(self):
+        return observe_query(self._table, self._operation, self._builder.execute)
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                operation = name if name in QUERY_OPERATIONS else self._operation
+                return _ScopedRequestBuilder(result, self._auth_header, self._table, operation)
+            return result
+
+        return wrapper
+
+
+class ScopedSupabaseClient:
     """
-    Creates and returns a Supabase client instance using Streamlit secrets
+    Lightweight per-user view over the shared Supabase client.
+
+    Table and RPC calls go through the shared connection pool, with the
+    user's access token applied to each request instead of being stored
+    on the shared client.
+    """
+
+    def __init__(self, client: Client, access_token: str = None):
+        self.client = client
+        self.auth_header = f"Bearer {access_token}" if access_token else None
+
+    def table(self, table_name: str):
+        return _ScopedRequestBuilder(self.client.table(table_name), self.auth_header, table_name)
+
+    def from_(self, table_name: str):
+        return self.table(table_name)
+
+    def rpc(self, fn: str, params: dict = None):
+        return _ScopedRequestBuilder(self.client.rpc(fn, params or {}), self.auth_header, fn, 'rpc')
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def get_supabase_client() -> ScopedSupabaseClient:
+    """
+    Returns a Supabase client scoped to the current Streamlit session.
+
+    The returned object is cheap to create: it wraps the process-wide
+    client and only carries the current user's access token.
     """
     try:
-        # Retrieve Supabase URL and key from Streamlit secrets
-        url = st.secrets["SUPABASE_URL"]
-        key = st.secrets["SUPABASE_KEY"]
-       
-        supabase: Client = create_client(url, key)
-        return supabase
+        session = current_session()
+        return ScopedSupabaseClient(get_shared_client(), session.access_token if session else None)
     except Exception as e:
         st.error(f"Error initializing Supabase client: {e}")
         raise
@@ -22,22 +143,10 @@ def get_session():
     Get the current Supabase session with robust error handling
     """
     try:
-        # Check if session exists in Streamlit session state first
-        if 'supabase_session' in st.session_state:
-            return st.session_state.supabase_session
-
-        supabase = get_supabase_client()
-        
-        # Try to get the current session from Supabase
-        session = supabase.auth.get_session()
-        
-        # If session exists, store it in Streamlit session state
-        if session:
-            st.session_state.supabase_session = session
-            return session
-        
-        return None
-    
+        # Sessions live in Streamlit session state and are verified
+        # locally; the shared client never holds a user session of its own
+        return current_session()
+
     except Exception as e:
         st.error(f"Error retrieving session: {e}")
         return None
@@ -47,4 +156,4 @@ def is_user_authenticated():
     Check if a user is currently authenticated
     """
     session = get_session()
-    return session is not None and session.user is not None
\ No newline at end of file
+    return session is not None and session.user is not None
@@ -3,13 +3,42 @@ import uuid
 from typing import List, Dict, Any
 from src.config.supabase_client import get_supabase_client, get_session, is_user_authenticated
 from src.services.form_service import FormService
+from src.utils.metrics import instrument_fragment
 import time
 
+# Mapping of user-friendly types to database-compatible types
+QUESTION_TYPES = {
+    'Short Text': 'short_text',
+    'Long Text': 'long_text',
+    'Multiple Choice': 'multiple_choice',
+    'Checkboxes': 'checkbox',
+    'Date': 'date',
+    'Number': 'number'
+}
+
+
+def new_question() -> Dict[str, Any]:
+    """
+    Compact builder state of a question; uid keys its widgets
+    """
+    return {'uid': uuid.uuid4().hex[:8], 'text': '', 'type': 'short_text', 'is_required': False, 'options': None}
+
+
+def add_question():
+    st.session_state.questions.append(new_question())
+
+
+def remove_last_question():
+    st.session_state.questions.pop()
+
+
 class FormCreationPage:
     def __init__(self):
         self.supabase = get_supabase_client()
         self.form_service = FormService(self.supabase)
         self.session = get_session()
+        # Queries made by fragment reruns are labelled with this page
+        self.render_question_editor = st.fragment(instrument_fragment(self.render_question_input))
 
     def validate_form(self, form_title: str, questions: List[Dict[str, Any]]) -> bool:
         """
@@ -34,57 +63,51 @@ class FormCreationPage:
         
         return True
 
-    def render_question_input(self, index: int) -> Dict[str, Any]:
+    def render_question_input(self, index: int, question: Dict[str, Any]) -> None:
         """
         Render individual question input fields
+
+        Runs as a fragment, so editing a question reruns only its own
+        editor. Widget values are written back into the compact question
+        dict held in st.session_state.questions.
         """
-        # Mapping of user-friendly types to database-compatible types
-        type_mapping = {
-            'Short Text': 'short_text',
-            'Long Text': 'long_text',
-            'Multiple Choice': 'multiple_choice',
-            'Checkboxes': 'checkbox',
-            'Date': 'date',
-            'Number': 'number'
-        }
+        uid = question['uid']
 
         st.subheader(f"Question {index}")
         
         # Question text
-        question_text = st.text_input(
+        question['text'] = st.text_input(
             f"Question {index} Text", 
-            key=f"question_text_{index}"
+            value=question['text'],
+            key=f"question_text_{uid}"
         )
         
         # Question type selection with corrected types
-        question_type = st.selectbox(
+        type_label = st.selectbox(
             f"Question {index} Type", 
-            list(type_mapping.keys()),
-            key=f"question_type_{index}"
+            list(QUESTION_TYPES.keys()),
+            index=list(QUESTION_TYPES.values()).index(question['type']),
+            key=f"question_type_{uid}"
         )
+        question['type'] = QUESTION_TYPES[type_label]
         
         # Optional settings
-        is_required = st.checkbox(
+        question['is_required'] = st.checkbox(
             "Required Question", 
-            key=f"is_required_{index}"
+            value=question['is_required'],
+            key=f"is_required_{uid}"
         )
         
         # Additional options based on question type
-        options = []
-        if question_type == 'Multiple Choice':
+        if question['type'] == 'multiple_choice':
             option_input = st.text_input(
                 f"Enter options (comma-separated)", 
-                key=f"options_{index}"
+                value=', '.join(question['options'] or []),
+                key=f"options_{uid}"
             )
-            options = [opt.strip() for opt in option_input.split(',') if opt.strip()]
-        
-        return {
-            'text': question_text,
-            'type': type_mapping[question_type],  # Use mapped database-compatible type
-            'is_required': is_required,
-            'options': options if options else None,
-            'id': str(uuid.uuid4())
-        }
+            question['options'] = [opt.strip() for opt in option_input.split(',') if opt.strip()] or None
+        else:
+            question['options'] = None
 
     def render_page(self):
         """
@@ -111,38 +134,29 @@ class FormCreationPage:
         if 'questions' not in st.session_state:
             st.session_state.questions = []
 
-        # Render existing questions
-        questions_to_save = []
-        for idx, _ in enumerate(st.session_state.questions, 1):
+        # Render existing questions, each in its own fragment
+        for idx, question in enumerate(st.session_state.questions, 1):
             with st.expander(f"Question {idx}", expanded=True):
-                question = self.render_question_input(idx)
-                questions_to_save.append(question)
+                self.render_question_editor(idx, question)
+        questions_to_save = st.session_state.questions
 
         # Horizontal buttons for managing questions and form
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            # Add Question Button
-            add_question = st.button("➕ Add Question", key="add_question_button", use_container_width=True)
+            # Add Question Button; the callback runs before the next
+            # script run, so no extra rerun is needed
+            st.button("➕ Add Question", key="add_question_button", on_click=add_question, use_container_width=True)
         
         with col2:
             # Remove Last Question Button (only show if questions exist)
             if st.session_state.questions:
-                remove_question = st.button("🗑️ Remove Last Question", key="remove_last_question", use_container_width=True)
+                st.button("🗑️ Remove Last Question", key="remove_last_question", on_click=remove_last_question, use_container_width=True)
         
         with col3:
             # Create Form Button
             create_form = st.button("🖋️ Create Form", key="create_form_button", use_container_width=True)
 
-        # Handle button actions
-        if add_question:
-            st.session_state.questions.append({})
-            st.rerun()
-        
-        if 'remove_question' in locals() and remove_question:
-            st.session_state.questions.pop()
-            st.rerun()
-        
         if create_form:
             if self.validate_form(form_title, questions_to_save):
                 try:
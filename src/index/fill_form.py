@@ -1,12 +1,28 @@
 import streamlit as st
 import time
-from src.config.supabase_client import get_supabase_client
+from src.config.supabase_client import get_supabase_client, get_session, get_shared_client, ScopedSupabaseClient
+from src.services.response_service import ResponseService
+from src.services.submission_queue import get_submission_queue
+from src.services.answer_validator import AnswerValidator
+from src.services.form_schema import FormSchemaService
 from typing import Dict, List, Any
 from datetime import datetime
 
+def secret_flag(name: str) -> bool:
+    """
+    Read a boolean secret; strings such as "false" or "0" count as off
+    """
+    value = st.secrets.get(name, False)
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
 class FormFillService:
     def __init__(self):
         self.supabase = get_supabase_client()
+        self.form_schema_service = FormSchemaService(self.supabase)
+        self.response_service = ResponseService(self.supabase)
+        self.session = get_session()
         
     def get_form_details(self, form_id: str) -> Dict[str, Any]:
         """
@@ -19,61 +35,31 @@ class FormFillService:
             Dict containing form, questions, and creator details
         """
         try:
-            # Fetch form details
-            form_response = self.supabase.table('forms').select('*').eq('id', form_id).execute()
-            
-            if not form_response.data:
-                return None
-            
-            form = form_response.data[0]
-            
-            # Fetch creator details
-            creator_response = (
-                self.supabase.table('user_info')
-                .select('*')
-                .eq('id', form['creator_id'])
-                .execute()
-            )
-            
-            # Fetch questions for this form
-            questions_response = (
-                self.supabase.table('questions')
-                .select('*')
-                .eq('form_id', form_id)
-                .order('order_number')
-                .execute()
-            )
-            
-            # Format creator name
-            creator_name = 'Unknown Creator'
-            if creator_response.data:
-                creator = creator_response.data[0]
-                first_name = creator.get('first_name', '').strip()
-                last_name = creator.get('last_name', '').strip()
-                email = creator.get('email', '').strip()
-                
-                if first_name or last_name:
-                    creator_name = f"{first_name} {last_name}".strip()
-                elif email:
-                    creator_name = email
-            
-            # Format timestamp
-            created_at = datetime.fromisoformat(form['created_at'].replace('Z', '+00:00'))
-            formatted_date = created_at.strftime("%B %d, %Y")
-            formatted_time = created_at.strftime("%I:%M %p")
-            
-            return {
-                'form': form,
-                'questions': questions_response.data,
-                'creator_name': creator_name,
-                'formatted_date': formatted_date,
-                'formatted_time': formatted_time
-            }
+            # Compiled schemas are cached per process and revalidated
+            # against the form's updated_at
+            return self.form_schema_service.get_form_schema(form_id)
         except Exception as e:
             st.error(f"Error fetching form: {e}")
             return None
 
-    def submit_response(self, form_id: str, answers: List[Dict[str, Any]], is_anon: bool = False) -> Dict:
+    def get_write_behind_queue(self, form: Dict[str, Any]):
+        """
+        Return the write-behind submission queue when it applies to this form
+
+        Write-behind mode is opt-in through the WRITE_BEHIND_SUBMISSIONS
+        secret and only used for public forms. The queue writes with the
+        shared, unauthenticated client, so it only takes submissions that
+        are not linked to a respondent.
+        """
+        if not secret_flag('WRITE_BEHIND_SUBMISSIONS') or not form.get('is_public'):
+            return None
+        # Each process keeps its own WAL directory under this root
+        wal_dir = st.secrets.get('SUBMISSION_WAL_DIR', '.submission_wal')
+        # Unscoped wrapper: no user token, but flushes still show up in
+        # the query metrics
+        return get_submission_queue(ResponseService(ScopedSupabaseClient(get_shared_client())), wal_dir)
+
+    def submit_response(self, form_id: str, answers: List[Dict[str, Any]], is_anon: bool = False, form: Dict[str, Any] = None) -> Dict:
         """
         Submit form responses with more detailed error handling
         
@@ -81,46 +67,33 @@ class FormFillService:
             form_id (str): ID of the form being submitted
             answers (List[Dict]): List of answer dictionaries
             is_anon (bool, optional): Whether submission is anonymous
+            form (Dict, optional): Form row, used to decide on write-behind mode
         
         Returns:
             Dict with submission status and message
         """
         try:
-            # Start transaction
-            self.supabase.rpc('begin')
-            
-            # Create response entry
-            response_insert = {
-                'form_id': form_id,
-                'is_anon': is_anon
-            }
-            response_result = self.supabase.table('responses').insert(response_insert).execute()
-            
-            if not response_result.data:
-                return {'success': False, 'message': "Failed to create response entry"}
-            
-            response_id = response_result.data[0]['id']
-            
-            # Prepare answer entries
-            answer_entries = [
-                {
-                    'response_id': response_id,
-                    'question_id': answer['question_id'],
-                    'answer_value': answer.get('answer_value'),
-                    'checkbox_value': answer.get('checkbox_value')
-                }
-                for answer in answers
-            ]
-            
-            # Insert answers
-            self.supabase.table('response_answers').insert(answer_entries).execute()
-            
-            # Commit transaction
-            self.supabase.rpc('commit')
+            # Anonymous responses are not linked to the respondent
+            respondent_id = None
+            if not is_anon and self.session:
+                respondent_id = self.session.user.id
+
+            # Unlinked submissions to public forms can be acknowledged as soon
+            # as they are in the local write-ahead log
+            queue = self.get_write_behind_queue(form) if form and respondent_id is None else None
+            if queue is not None:
+                response_id = queue.enqueue(form_id, answers, is_anon=is_anon)
+                return {'success': True, 'message': "Form submitted successfully!", 'response_id': response_id}
+
+            # Response row and answers are inserted atomically in one call
+            response_id = self.response_service.submit_response(
+                form_id,
+                answers,
+                is_anon=is_anon,
+                respondent_id=respondent_id
+            )
             return {'success': True, 'message': "Form submitted successfully!", 'response_id': response_id}
         except Exception as e:
-            # Rollback in case of error
-            self.supabase.rpc('rollback')
             return {'success': False, 'message': f"Error submitting response: {str(e)}"}
 
 def render_question(question: Dict[str, Any]) -> Dict[str, Any]:
@@ -138,8 +111,6 @@ def render_question(question: Dict[str, Any]) -> Dict[str, Any]:
     q_id = question['id']
     q_required = question['is_required']
     q_options = question['options'] or []
-
-    st.markdown(f'<style>label {{font-size: 18px !important;}} .stRadio div {{font-size: 16px !important;}}</style>', unsafe_allow_html=True)
     
     # Add required validation
     key = f"question_{q_id}"
@@ -244,36 +215,40 @@ def render_page():
     st.markdown(f"**Creator:** {form_details['creator_name']}")
     st.markdown(f"**Created on:** {form_details['formatted_date']} at {form_details['formatted_time']}")
     
-    # Optional: Anonymous submission toggle if form allows
-    is_anon = False
-    if form['allow_anon']:
-        is_anon = st.checkbox("Submit Anonymously", value=False)
-    
-    # Render questions
-    answers = []
-    for question in questions:
-        answer = render_question(question)
-        if answer:
-            answers.append(answer)
-    
-    # Submit button
-    if st.button("Submit Form"):
-        # Validate required questions
-        required_questions = [q for q in questions if q['is_required']]
-        missing_answers = any(
-            not next((a.get('answer_value') or a.get('checkbox_value') for a in answers if a['question_id'] == q['id']), False)
-            for q in required_questions
-        )
+    # Question styling is injected once per run, not once per question
+    st.markdown('<style>label {font-size: 18px !important;} .stRadio div {font-size: 16px !important;}</style>', unsafe_allow_html=True)
+    
+    # Widgets inside a form only send their values on submit, so filling
+    # in answers does not rerun the script
+    with st.form(key=f"fill_form_{form_id}"):
+        # Optional: Anonymous submission toggle if form allows
+        is_anon = False
+        if form['allow_anon']:
+            is_anon = st.checkbox("Submit Anonymously", value=False)
         
-        if missing_answers:
-            st.error("Please fill out all required questions.")
+        # Render questions
+        answers = []
+        for question in questions:
+            answer = render_question(question)
+            if answer:
+                answers.append(answer)
+        
+        submitted = st.form_submit_button("Submit Form")
+    
+    if submitted:
+        # Validate required fields, options and numbers in one pass
+        errors = AnswerValidator(questions).validate(answers)
+        
+        if errors:
+            st.error("Please fix the following before submitting:\n\n" + "\n".join(f"- {error}" for error in errors))
             return
         
         # Submit response
         submission_result = form_service.submit_response(
             form_id, 
             answers, 
-            is_anon=is_anon
+            is_anon=is_anon,
+            form=form
         )
         
         # Store submission status in session state
@@ -283,6 +258,9 @@ def render_page():
         if submission_result['success']:
             st.success(submission_result['message'])
             
+            # Reload My Responses so the new submission shows up
+            st.session_state.pop('my_responses', None)
+            
             # Create a placeholder for countdown
             countdown_placeholder = st.empty()
             
@@ -1,9 +1,25 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
-import random
 from src.config.supabase_client import get_supabase_client, get_session, is_user_authenticated
+from src.services.analytics_snapshots import AnalyticsSnapshotService
+from src.services.export_service import EXPORT_FORMATS, ResponseExporter, create_export_file, remove_export_file
+
+# Lookback windows offered by the time period selector
+TIME_PERIODS = {
+    "Last 7 Days": timedelta(days=7),
+    "Last 30 Days": timedelta(days=30),
+    "Last 3 Months": timedelta(days=90),
+    "All Time": None
+}
+
+def discard_export():
+    """
+    Forget the session's export and delete its file, e.g. once it is downloaded
+    """
+    export = st.session_state.pop('analytics_export', None)
+    if export:
+        remove_export_file(export['path'])
 
 class FormAnalyticsPage:
     def __init__(self):
@@ -15,193 +31,212 @@ class FormAnalyticsPage:
 
         self.supabase = get_supabase_client()
         self.session = get_session()
-        
-        # Generate dummy data for demonstration
-        self.generate_dummy_data()
-
-    def generate_dummy_data(self):
-        """Generate dummy data for individual form analytics"""
-        # Basic form info
-        self.form_info = {
-            'title': 'Customer Feedback Survey',
-            'created_at': datetime.now() - timedelta(days=30),
-            'last_response': datetime.now() - timedelta(hours=2),
-            'total_responses': 234,
-            'completion_rate': 88.5,
-            'avg_time': '3m 45s'
-        }
-        
-        # Response timeline
-        dates = pd.date_range(end=datetime.now(), periods=30, freq='D')
-        self.daily_responses = {
-            'dates': dates,
-            'responses': [random.randint(5, 15) for _ in range(30)],
-            'completion_rates': [random.uniform(80, 95) for _ in range(30)]
-        }
-        
-        # Question-specific data
-        self.questions_data = {
-            'Q1': {
-                'text': 'How satisfied are you with our service?',
-                'type': 'rating',
-                'responses': {
-                    '5 stars': 45,
-                    '4 stars': 30,
-                    '3 stars': 15,
-                    '2 stars': 7,
-                    '1 star': 3
-                }
-            },
-            'Q2': {
-                'text': 'Which features do you use most?',
-                'type': 'multiple_choice',
-                'responses': {
-                    'Feature A': 120,
-                    'Feature B': 89,
-                    'Feature C': 67,
-                    'Feature D': 45
-                }
-            },
-            'Q3': {
-                'text': 'Would you recommend us to others?',
-                'type': 'boolean',
-                'responses': {
-                    'Yes': 85,
-                    'No': 15
-                }
+        self.snapshots = AnalyticsSnapshotService(self.supabase)
+
+    def get_user_forms(self):
+        """
+        Retrieve the current user's forms for the form selector
+        """
+        try:
+            response = (
+                self.supabase.table('forms')
+                .select('*')
+                .eq('creator_id', self.session.user.id)
+                .order('created_at', desc=True)
+                .execute()
+            )
+            return response.data or []
+        except Exception as e:
+            st.error(f"Error fetching forms: {e}")
+            return []
+
+    def format_form_label(self, form):
+        """
+        Build a readable label for a form in the selector
+        """
+        created_at = datetime.fromisoformat(form['created_at'].replace('Z', '+00:00'))
+        title = form.get('title') or "Form"
+        return f"{title} - {created_at.strftime('%B %d, %Y')} ({form['id'][:8]})"
+
+    def load_analytics(self, form_id, time_period):
+        """
+        Compute analytics for a form over the selected time period
+        """
+        try:
+            lookback = TIME_PERIODS[time_period]
+            since = pd.Timestamp.now(tz='UTC') - lookback if lookback else None
+            # Folds only responses committed since the stored snapshot's watermark
+            return self.snapshots.get_form_analytics(form_id, self.session.user.id, since)
+        except Exception as e:
+            st.error(f"Error computing analytics: {e}")
+            return None
+
+    def export_responses(self, form_id, export_format):
+        """
+        Export a form's responses in the chosen format to a file on disk
+
+        Only the file's path is kept in session state; the file is removed
+        once downloaded or when the next export replaces it.
+        """
+        discard_export()
+        path = None
+        try:
+            path = create_export_file(EXPORT_FORMATS[export_format]['extension'])
+            with st.spinner("Exporting responses..."):
+                with open(path, 'wb') as fileobj:
+                    written = ResponseExporter(self.supabase).export(form_id, export_format, fileobj)
+            
+            st.session_state.analytics_export = {
+                'form_id': form_id,
+                'format': export_format,
+                'path': path,
+                'rows': written
             }
-        }
+        except Exception as e:
+            if path:
+                remove_export_file(path)
+            st.error(f"Error exporting responses: {e}")
+
+    def render_export_download(self, form_id):
+        """
+        Offer the latest export of the selected form for download
+        """
+        export = st.session_state.get('analytics_export')
+        if not export or export['form_id'] != form_id:
+            return
         
-        # Demographic data
-        self.demographics = {
-            'locations': {
-                'USA': 45,
-                'UK': 20,
-                'Canada': 15,
-                'Australia': 10,
-                'Other': 10
-            },
-            'devices': {
-                'Desktop': 50,
-                'Mobile': 40,
-                'Tablet': 10
-            },
-            'browsers': {
-                'Chrome': 55,
-                'Safari': 25,
-                'Firefox': 15,
-                'Other': 5
-            }
-        }
+        export_format = EXPORT_FORMATS[export['format']]
+        try:
+            fileobj = open(export['path'], 'rb')
+        except FileNotFoundError:
+            # Removed as stale after the session sat idle
+            st.session_state.pop('analytics_export', None)
+            return
+        with fileobj:
+            st.download_button(
+                f"Download {export['format']} ({export['rows']} responses)",
+                data=fileobj,
+                file_name=f"form_{form_id[:8]}_responses.{export_format['extension']}",
+                mime=export_format['mime'],
+                on_click=discard_export,
+                use_container_width=True
+            )
+
+    def render_question_analysis(self, analytics):
+        """
+        Render a chart or summary for every question of the form
+        """
+        import plotly.express as px
+
+        for idx, question in enumerate(analytics['questions'], 1):
+            with st.expander(f"Q{idx}: {question['text']}", expanded=True):
+                st.caption(f"{question['type']} - answered by {question['answered']} respondents")
+
+                if question['distribution']:
+                    fig = px.bar(
+                        x=list(question['distribution'].keys()),
+                        y=list(question['distribution'].values()),
+                        title=f'Responses for Q{idx}'
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                elif question['number_stats']:
+                    stats = question['number_stats']
+                    col1, col2, col3, col4 = st.columns(4)
+                    col1.metric("Mean", f"{stats['mean']:.2f}")
+                    col2.metric("Median", f"{stats['median']:.2f}")
+                    col3.metric("Min", f"{stats['min']:g}")
+                    col4.metric("Max", f"{stats['max']:g}")
+                    edges = stats['histogram']['edges']
+                    fig = px.bar(
+                        x=[f"{edges[i]:g} - {edges[i + 1]:g}" for i in range(len(edges) - 1)],
+                        y=stats['histogram']['counts'],
+                        title=f'Distribution for Q{idx}'
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.info("No chart available for this question type.")
 
     def render_page(self):
         st.title("Form Analytics")
         
+        forms = self.get_user_forms()
+        if not forms:
+            st.info("You haven't created any forms yet. Click 'Create Form' to get started!")
+            return
+        
         # Form selector
-        selected_form = st.selectbox(
+        forms_by_id = {form['id']: form for form in forms}
+        selected_form_id = st.selectbox(
             "Select Form",
-            ["Customer Feedback Survey", "Employee Satisfaction", "Event Registration"],
+            list(forms_by_id),
+            format_func=lambda form_id: self.format_form_label(forms_by_id[form_id]),
             index=0
         )
         
         # Time period selector
-        col1, col2 = st.columns([3, 1])
+        col1, col2, col3 = st.columns([3, 1, 1])
         with col1:
             time_period = st.selectbox(
                 "Time Period",
-                ["Last 7 Days", "Last 30 Days", "Last 3 Months", "All Time"],
+                list(TIME_PERIODS),
                 index=1
             )
         with col2:
-            st.button("Export Data", type="primary", use_container_width=True)
+            export_format = st.selectbox("Export Format", list(EXPORT_FORMATS))
+        with col3:
+            if st.button("Export Data", type="primary", use_container_width=True):
+                self.export_responses(selected_form_id, export_format)
+        
+        self.render_export_download(selected_form_id)
+        
+        analytics = self.load_analytics(selected_form_id, time_period)
+        if not analytics:
+            return
+        totals = analytics['totals']
         
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Responses", self.form_info['total_responses'], "+12 today")
+            st.metric("Total Responses", totals['total_responses'], f"+{totals['responses_today']} today")
         with col2:
-            st.metric("Completion Rate", f"{self.form_info['completion_rate']}%", "+1.2%")
+            st.metric("Anonymous Responses", totals['anonymous_responses'])
         with col3:
-            st.metric("Avg. Response Time", self.form_info['avg_time'], "-15s")
+            st.metric("Questions", len(analytics['questions']))
         with col4:
-            st.metric("Active Users", "45", "+5")
+            last_response = totals['last_response']
+            st.metric("Last Response", last_response.strftime("%b %d, %Y") if last_response is not None else "-")
+        
+        if totals['total_responses'] == 0:
+            st.info("No responses in this time period yet.")
+            return
         
         # Create tabs for different analytics views
-        tab1, tab2, tab3 = st.tabs(["Response Analytics", "Question Analysis", "Demographics"])
+        tab1, tab2 = st.tabs(["Response Analytics", "Question Analysis"])
         
         with tab1:
             # Response timeline
             st.subheader("Response Timeline")
+            timeline = analytics['timeline']
             response_data = pd.DataFrame({
-                'Date': self.daily_responses['dates'],
-                'Responses': self.daily_responses['responses'],
-                'Completion Rate': self.daily_responses['completion_rates']
+                'Date': timeline.index,
+                'Responses': timeline.to_numpy()
             })
             
             import plotly.express as px
-            fig = px.line(response_data, x='Date', y=['Responses', 'Completion Rate'],
+            fig = px.line(response_data, x='Date', y='Responses',
                          title='Daily Response Trend')
             st.plotly_chart(fig, use_container_width=True)
             
             # Response patterns
-            col1, col2 = st.columns(2)
-            with col1:
-                st.subheader("Response Times")
-                times = ['Morning', 'Afternoon', 'Evening', 'Night']
-                values = [30, 40, 20, 10]
-                fig = px.pie(values=values, names=times, title='Response Time Distribution')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                st.subheader("Completion Funnel")
-                stages = ['Viewed', 'Started', 'Halfway', 'Completed']
-                values = [1000, 800, 600, 400]
-                fig = px.funnel(x=values, y=stages)
-                st.plotly_chart(fig, use_container_width=True)
+            st.subheader("Response Times")
+            time_of_day = analytics['time_of_day']
+            fig = px.pie(values=list(time_of_day.values()), names=list(time_of_day.keys()),
+                         title='Response Time Distribution (UTC)')
+            st.plotly_chart(fig, use_container_width=True)
         
         with tab2:
             st.subheader("Question Analysis")
-            
-            # Individual question analysis
-            for q_id, question in self.questions_data.items():
-                with st.expander(f"{q_id}: {question['text']}", expanded=True):
-                    if question['type'] in ['rating', 'multiple_choice', 'boolean']:
-                        fig = px.bar(
-                            x=list(question['responses'].keys()),
-                            y=list(question['responses'].values()),
-                            title=f'Responses for {q_id}'
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-        
-        with tab3:
-            st.subheader("Demographics")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                # Location distribution
-                fig = px.pie(
-                    values=list(self.demographics['locations'].values()),
-                    names=list(self.demographics['locations'].keys()),
-                    title='Response Distribution by Location'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Device distribution
-                fig = px.pie(
-                    values=list(self.demographics['devices'].values()),
-                    names=list(self.demographics['devices'].keys()),
-                    title='Response Distribution by Device'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            
-            # Browser distribution
-            fig = px.bar(
-                x=list(self.demographics['browsers'].keys()),
-                y=list(self.demographics['browsers'].values()),
-                title='Response Distribution by Browser'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            self.render_question_analysis(analytics)
 
 def render_page():
     page = FormAnalyticsPage()
@@ -1,8 +1,16 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-import random
 from src.config.supabase_client import get_supabase_client, get_session, is_user_authenticated
+from src.services.dashboard_service import DashboardService
+
+# Lookback windows offered by the time period selector
+TIME_PERIODS = {
+    "Last 7 Days": timedelta(days=7),
+    "Last 30 Days": timedelta(days=30),
+    "Last 6 Months": timedelta(days=183),
+    "All Time": None
+}
 
 class FormsDashboardPage:
     def __init__(self):
@@ -14,135 +22,121 @@ class FormsDashboardPage:
 
         self.supabase = get_supabase_client()
         self.session = get_session()
-        
-        # Generate dummy data for demonstration
-        self.generate_dummy_data()
+        self.dashboard_service = DashboardService(self.supabase)
 
-    def generate_dummy_data(self):
-        """Generate dummy data for dashboard demonstration"""
-        # Overall forms data
-        self.total_forms = 15
-        self.active_forms = 12
-        self.total_responses = 847
-        self.response_rate = 76.5
-        
-        # Monthly data (last 6 months)
-        months = pd.date_range(end=datetime.now(), periods=6, freq='M')
-        self.monthly_data = {
-            'dates': months,
-            'responses': [random.randint(80, 150) for _ in range(6)],
-            'completion_rates': [random.uniform(70, 95) for _ in range(6)]
-        }
-        
-        # Form categories
-        self.form_categories = {
-            'Feedback': 5,
-            'Survey': 4,
-            'Registration': 3,
-            'Quiz': 2,
-            'Other': 1
-        }
-        
-        # Response times
-        self.response_times = {
-            '<1 min': 15,
-            '1-2 min': 35,
-            '2-5 min': 30,
-            '5-10 min': 15,
-            '>10 min': 5
-        }
-        
-        # Device distribution
-        self.device_data = {
-            'Desktop': 45,
-            'Mobile': 40,
-            'Tablet': 15
-        }
-        
-        # Recent activity
-        self.recent_activity = [
-            {'time': datetime.now() - timedelta(minutes=30), 'action': 'New response received', 'form': 'Customer Feedback'},
-            {'time': datetime.now() - timedelta(hours=2), 'action': 'Form created', 'form': 'Employee Survey'},
-            {'time': datetime.now() - timedelta(hours=5), 'action': 'Form edited', 'form': 'Product Registration'},
-            {'time': datetime.now() - timedelta(hours=8), 'action': 'New response received', 'form': 'Event Registration'}
-        ]
+    def load_rollup(self, force_refresh=False):
+        """
+        Load the creator's cached cross-form rollup
+        """
+        try:
+            return self.dashboard_service.get_rollup(self.session.user.id, force_refresh)
+        except Exception as e:
+            st.error(f"Error loading dashboard: {e}")
+            return None
+
+    def response_trend(self, rollup, time_period):
+        """
+        Build the response trend for the selected period
+
+        Short periods use the daily series, longer ones the monthly series.
+        """
+        lookback = TIME_PERIODS[time_period]
+        if lookback is not None and lookback <= timedelta(days=30):
+            series, column = rollup['daily'], 'day'
+        else:
+            series, column = rollup['monthly'], 'month'
+
+        trend = pd.DataFrame(series, columns=[column, 'responses'])
+        trend['Date'] = pd.to_datetime(trend[column], utc=True, format='ISO8601')
+        trend = trend.rename(columns={'responses': 'Responses'})[['Date', 'Responses']]
+
+        if lookback is not None:
+            since = pd.Timestamp.now(tz='UTC') - lookback
+            if column == 'month':
+                since = since.normalize().replace(day=1)
+            trend = trend[trend['Date'] >= since]
+        return trend
+
+    def format_form_label(self, form_id):
+        """
+        Short label for a form in charts and activity entries
+        """
+        return f"Form {form_id[:8]}"
 
     def render_page(self):
         st.title("Forms Dashboard")
         
         # Time period selector
-        time_period = st.selectbox(
-            "Time Period",
-            ["Last 7 Days", "Last 30 Days", "Last 6 Months", "All Time"],
-            index=2
-        )
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            time_period = st.selectbox(
+                "Time Period",
+                list(TIME_PERIODS),
+                index=2
+            )
+        with col2:
+            refresh = st.button("Refresh", use_container_width=True)
+        
+        rollup = self.load_rollup(force_refresh=refresh)
+        if rollup is None:
+            return
+        
+        forms = rollup['forms']
+        if not forms:
+            st.info("You haven't created any forms yet. Click 'Create Form' to get started!")
+            return
+        
+        total_responses = sum(form['responses'] for form in forms)
+        public_forms = sum(1 for form in forms if form['is_public'])
+        trend = self.response_trend(rollup, time_period)
         
         # Key metrics in columns
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Forms", self.total_forms, "+2 this month")
+            st.metric("Total Forms", len(forms))
         with col2:
-            st.metric("Active Forms", self.active_forms, "-1 this month")
+            st.metric("Public Forms", public_forms)
         with col3:
-            st.metric("Total Responses", self.total_responses, "+125 this month")
+            st.metric("Total Responses", total_responses, f"+{int(trend['Responses'].sum())} in period")
         with col4:
-            st.metric("Avg. Response Rate", f"{self.response_rate}%", "+2.3%")
+            st.metric("Avg. Responses per Form", f"{total_responses / len(forms):.1f}")
+        
+        st.caption(f"Updated {datetime.fromtimestamp(rollup['computed_at']).strftime('%I:%M %p')}")
         
-        # Response trend and completion rate
+        # Response trend
         st.subheader("Response Trends")
-        response_data = pd.DataFrame({
-            'Date': self.monthly_data['dates'],
-            'Responses': self.monthly_data['responses'],
-            'Completion Rate': self.monthly_data['completion_rates']
-        })
         
         # Create tabs for different visualizations
         tab1, tab2, tab3 = st.tabs(["Response Analytics", "Form Distribution", "Recent Activity"])
         
         with tab1:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.subheader("Monthly Responses")
-                import plotly.express as px
-                fig = px.line(response_data, x='Date', y='Responses',
-                            title='Monthly Response Trend')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                st.subheader("Response Times")
-                fig = px.pie(
-                    values=list(self.response_times.values()),
-                    names=list(self.response_times.keys()),
-                    title='Response Time Distribution'
-                )
+            import plotly.express as px
+            if trend.empty:
+                st.info("No responses in this time period.")
+            else:
+                fig = px.line(trend, x='Date', y='Responses',
+                            title='Response Trend')
                 st.plotly_chart(fig, use_container_width=True)
         
         with tab2:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.subheader("Form Categories")
-                fig = px.bar(
-                    x=list(self.form_categories.keys()),
-                    y=list(self.form_categories.values()),
-                    title='Forms by Category'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                st.subheader("Device Distribution")
-                fig = px.pie(
-                    values=list(self.device_data.values()),
-                    names=list(self.device_data.keys()),
-                    title='Responses by Device'
-                )
-                st.plotly_chart(fig, use_container_width=True)
+            st.subheader("Responses per Form")
+            top_forms = sorted(forms, key=lambda form: form['responses'], reverse=True)[:20]
+            fig = px.bar(
+                x=[self.format_form_label(form['form_id']) for form in top_forms],
+                y=[form['responses'] for form in top_forms],
+                title='Top Forms by Responses'
+            )
+            st.plotly_chart(fig, use_container_width=True)
         
         with tab3:
             st.subheader("Recent Activity")
-            for activity in self.recent_activity:
+            if not rollup['recent_activity']:
+                st.info("No activity yet.")
+            for activity in rollup['recent_activity']:
+                activity_time = datetime.fromisoformat(activity['time'].replace('Z', '+00:00')).astimezone()
                 with st.container(border=True):
-                    st.text(f"{activity['time'].strftime('%I:%M %p')} - {activity['action']}")
-                    st.caption(f"Form: {activity['form']}")
+                    st.text(f"{activity_time.strftime('%b %d, %I:%M %p')} - {activity['action']}")
+                    st.caption(f"Form: {self.format_form_label(activity['form_id'])}")
 
 def render_page():
     page = FormsDashboardPage()
@@ -1,83 +1,69 @@
 import streamlit as st
-from src.config.supabase_client import get_supabase_client
-from src.services.form_service import FormService
+from src.config.supabase_client import get_supabase_client, get_shared_client, ScopedSupabaseClient
+from src.services.form_service import FormService, PUBLISHED_FORMS_PAGE_SIZE
+from src.services.user_directory import UserDirectory
+from src.services.search_index import get_search_index
 from datetime import datetime
 
 class ListFormsPage:
-    def __init__(self):
+    def __init__(self, page_size: int = PUBLISHED_FORMS_PAGE_SIZE):
         self.supabase = get_supabase_client()
         self.form_service = FormService(self.supabase)
+        self.user_directory = UserDirectory(self.supabase)
+        self.page_size = page_size
 
-    def get_published_forms(self):
+    def enrich_forms(self, forms):
         """
-        Retrieve all published forms with additional details
+        Add creator names and formatted timestamps to form rows
         """
-        try:
-            # First, let's print out all forms and their creator_ids for debugging
-            forms_response = (
-                self.supabase.table('forms')
-                .select('id, created_at, creator_id')
-                .eq('is_public', True)
-                .execute()
-            )
-            
-            print("Forms response:", forms_response.data)  # Debug print
-            
-            forms = forms_response.data or []
+        # Resolve every creator's name in one batched lookup
+        creator_names = self.user_directory.get_display_names(
+            form.get('creator_id') for form in forms
+        )
+        
+        for form in forms:
+            form['creator_name'] = creator_names.get(form.get('creator_id'), 'Unknown Creator')
             
-            for form in forms:
-                print(f"Processing form with creator_id: {form.get('creator_id')}")  # Debug print
-                
-                # Make sure creator_id exists and is not None
-                if not form.get('creator_id'):
-                    form['creator_name'] = 'Unknown Creator (No creator_id)'
-                    continue
+            # Format timestamps
+            if form['created_at']:
+                created_at = datetime.fromisoformat(form['created_at'].replace('Z', '+00:00'))
+                form['formatted_date'] = created_at.strftime("%B %d, %Y")
+                form['formatted_time'] = created_at.strftime("%I:%M %p")
 
-                # Get creator's info using creator_id with debug logging
-                user_info_response = (
-                    self.supabase.table('user_info')
-                    .select('*')  # Select all columns for debugging
-                    .eq('id', form['creator_id'])
-                    .execute()
-                )
+        return forms
 
-                if user_info_response.data and len(user_info_response.data) > 0:
-                    user_info = user_info_response.data[0]
-                    
-                    # Print all available fields in user_info for debugging
-                    print("Available user info fields:", user_info.keys())
-                    
-                    first_name = user_info.get('first_name', '').strip()
-                    last_name = user_info.get('last_name', '').strip()
-                    email = user_info.get('email', '').strip()
-                    
-                    print(f"Retrieved name parts: '{first_name}' '{last_name}' '{email}'")  # Debug print
+    def get_published_forms(self, cursor=None):
+        """
+        Retrieve one page of published forms with additional details
 
-                    # Set creator name with detailed fallback logging
-                    if first_name or last_name:
-                        form['creator_name'] = f"{first_name} {last_name}".strip()
-                        print(f"Using full name: {form['creator_name']}")
-                    elif email:
-                        form['creator_name'] = email
-                        print("Falling back to email")
-                    else:
-                        form['creator_name'] = 'Unknown Creator (No name or email)'
-                        print("No name or email found")
-                else:
-                    form['creator_name'] = 'Unknown Creator (No user info found)'
-                    print(f"No user info found for creator_id: {form['creator_id']}")
-                
-                # Format timestamps
-                if form['created_at']:
-                    created_at = datetime.fromisoformat(form['created_at'].replace('Z', '+00:00'))
-                    form['formatted_date'] = created_at.strftime("%B %d, %Y")
-                    form['formatted_time'] = created_at.strftime("%I:%M %p")
+        Args:
+            cursor (tuple, optional): Keyset cursor returned with the previous page
 
-            return forms
+        Returns:
+            dict: 'forms' for this page and 'next_cursor' for the following one
+        """
+        try:
+            page = self.form_service.get_published_forms_page(cursor, self.page_size)
+            self.enrich_forms(page['forms'])
+            return page
 
         except Exception as e:
-            print(f"Detailed error: {str(e)}")  # Debug print
             st.error(f"Error fetching published forms: {str(e)}")
+            return {'forms': [], 'next_cursor': None}
+
+    def search_forms(self, search_term):
+        """
+        Search published forms by title, description and question text
+        """
+        try:
+            # The index is shared by every user, so it is built without
+            # the current user's token
+            index = get_search_index(ScopedSupabaseClient(get_shared_client()))
+            # Copy the shared rows before adding per-session details
+            forms = [dict(form) for form in index.search(search_term, limit=self.page_size)]
+            return self.enrich_forms(forms)
+        except Exception as e:
+            st.error(f"Error searching forms: {str(e)}")
             return []
 
     def get_form_questions(self, form_id):
@@ -120,34 +106,65 @@ class ListFormsPage:
                 if question['options']:
                     st.write(f"**Options:** {', '.join(question['options'])}")
 
+    def render_form_card(self, form):
+        """
+        Render a single form summary with a details button
+        """
+        with st.container(border=True):
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.write(f"**Created by:** {form['creator_name']}")
+                st.write(f"**Created on:** {form['formatted_date']} at {form['formatted_time']}")
+            
+            with col2:
+                if st.button("View Details", key=f"details_{form['id']}"):
+                    self.render_form_details_modal(form)
+
     def render_page(self):
         """
         Main page rendering method
         """
         st.title("Published Forms")
         
-        # Search bar (non-functional for now)
-        search_term = st.text_input("Search Forms", placeholder="Coming soon...")
-        st.info("Search functionality coming soon!")
+        # Search bar
+        search_term = st.text_input("Search Forms", placeholder="Search by title, description or question...")
+        
+        if search_term.strip():
+            results = self.search_forms(search_term)
+            if not results:
+                st.info("No forms match your search.")
+            for form in results:
+                self.render_form_card(form)
+            return
         
-        # Fetch published forms
-        published_forms = self.get_published_forms()
+        # Forms loaded so far are kept across reruns; only new pages are fetched
+        if 'published_forms' not in st.session_state:
+            st.session_state.published_forms = self.get_published_forms()
+        
+        published_forms = st.session_state.published_forms['forms']
+        next_cursor = st.session_state.published_forms['next_cursor']
         
         # Display forms in a grid or list
         if not published_forms:
             st.info("No published forms available.")
         else:
             for form in published_forms:
-                with st.container(border=True):
-                    col1, col2 = st.columns([3, 1])
-                    
-                    with col1:
-                        st.write(f"**Created by:** {form['creator_name']}")
-                        st.write(f"**Created on:** {form['formatted_date']} at {form['formatted_time']}")
-                    
-                    with col2:
-                        if st.button("View Details", key=f"details_{form['id']}"):
-                            self.render_form_details_modal(form)
+                self.render_form_card(form)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if next_cursor and st.button("Load More", use_container_width=True):
+                page = self.get_published_forms(next_cursor)
+                st.session_state.published_forms = {
+                    'forms': published_forms + page['forms'],
+                    'next_cursor': page['next_cursor']
+                }
+                st.rerun()
+        with col2:
+            if st.button("Refresh", use_container_width=True):
+                del st.session_state.published_forms
+                st.rerun()
 
 def render_page():
     """
@@ -2,7 +2,10 @@ import streamlit as st
 import uuid
 from datetime import datetime
 from src.config.supabase_client import get_supabase_client, get_session, is_user_authenticated
+from src.services.dashboard_service import DashboardService
 from src.services.form_service import FormService
+from src.services.response_service import ResponseService
+from src.services.user_directory import UserDirectory
 
 class MyFormsPage:
     def __init__(self):
@@ -14,6 +17,8 @@ class MyFormsPage:
 
         self.supabase = get_supabase_client()
         self.form_service = FormService(self.supabase)
+        self.response_service = ResponseService(self.supabase)
+        self.user_directory = UserDirectory(self.supabase)
         self.session = get_session()
 
     def format_datetime(self, timestamp_str):
@@ -33,23 +38,10 @@ class MyFormsPage:
 
     def get_user_info(self, auth_user_id):
         """
-        Retrieve user information from user_info table using auth.users.id
+        Retrieve a user's display name from the shared user directory
         """
         try:
-            user_query = (
-                self.supabase.table('user_info')
-                .select('first_name, last_name, email')
-                .eq('id', auth_user_id)
-                .execute()
-            )
-            
-            if user_query.data:
-                user = user_query.data[0]
-                return (
-                    f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() or 
-                    user.get('email', 'Unknown User')
-                )
-            return "Unknown User"
+            return self.user_directory.get_display_name(auth_user_id, 'Unknown User')
         except Exception as e:
             print(f"Error fetching user info: {e}")
             return "Unknown User"
@@ -70,54 +62,20 @@ class MyFormsPage:
             
             creator_id = form_query.data.get('creator_id') if form_query.data else None
 
-            # Get all responses for the form
-            responses_query = (
-                self.supabase.table('responses')
-                .select('id, created_at, is_anon, form_id')
-                .eq('form_id', form_id)
-                .execute()
-            )
-            
-            responses = responses_query.data or []
-            
-            # Get questions for this form
-            questions_query = (
-                self.supabase.table('questions')
-                .select('id, questions_text, question_type, options, is_required')
-                .eq('form_id', form_id)
-                .execute()
-            )
-            questions = {q['id']: q for q in (questions_query.data or [])}
+            # Load responses with their answers in batched queries
+            responses = self.response_service.get_form_responses(form_id)
+
+            # Non-anonymous responses show the creator's info, resolved once
+            creator_name = None
+            if creator_id and any(not r['is_anon'] for r in responses):
+                creator_name = self.get_user_info(creator_id)
 
-            # Enrich responses with user details and answers
             for response in responses:
-                # For non-anonymous responses, use the creator's info
-                if not response['is_anon'] and creator_id:
-                    response['user_name'] = self.get_user_info(creator_id)
+                if not response['is_anon'] and creator_name:
+                    response['user_name'] = creator_name
                 else:
                     response['user_name'] = "Anonymous User"
 
-                # Get answers for this response
-                answers_query = (
-                    self.supabase.table('response_answers')
-                    .select('question_id, answer_value, checkbox_value')
-                    .eq('response_id', response['id'])
-                    .execute()
-                )
-                
-                # Format answers with question text
-                formatted_answers = []
-                for answer in answers_query.data or []:
-                    question = questions.get(answer['question_id'])
-                    if question:
-                        formatted_answers.append({
-                            'question_text': question['questions_text'],
-                            'question_type': question['question_type'],
-                            'answer_value': answer.get('answer_value'),
-                            'checkbox_value': answer.get('checkbox_value')
-                        })
-                
-                response['answers'] = formatted_answers
                 response['formatted_date'], response['formatted_time'] = self.format_datetime(response['created_at'])
             
             return responses
@@ -127,12 +85,15 @@ class MyFormsPage:
 
     def get_user_forms(self):
         """
-        Retrieve forms created by the current user
+        Retrieve forms created by the current user with their response counts
+
+        Counts come from an embedded aggregate in the same query; full
+        responses are loaded on demand by load_form_details.
         """
         try:
             response = (
                 self.supabase.table('forms')
-                .select('id, created_at, is_public, allow_anon')
+                .select('id, created_at, is_public, allow_anon, responses(count)')
                 .eq('creator_id', self.session.user.id)
                 .execute()
             )
@@ -141,13 +102,21 @@ class MyFormsPage:
             
             for form in forms:
                 form['formatted_date'], form['formatted_time'] = self.format_datetime(form.get('created_at'))
-                form['responses'] = self.get_form_responses(form['id'])
+                counts = form.pop('responses', None) or [{}]
+                form['response_count'] = counts[0].get('count', 0)
             
             return forms
         except Exception as e:
             st.error(f"Error fetching forms: {e}")
             return []
 
+    def load_form_details(self, form):
+        """
+        Load full responses for a single form when its details are opened
+        """
+        form['responses'] = self.get_form_responses(form['id'])
+        return form
+
     def render_form_details_modal(self, form):
         """
         Render a modal with detailed form information and responses
@@ -183,6 +152,59 @@ class MyFormsPage:
                         st.write(value if value else 'No response')
                     st.markdown("---")
 
+    def render_import_section(self, form):
+        """
+        Render a CSV upload that imports responses into a form
+
+        Only rendered for the form selected with its "Import CSV" button,
+        so the page holds at most one uploader.
+        """
+        with st.container(border=True):
+            st.write("**Import Responses from CSV**")
+            st.caption(
+                "Columns must match question texts (as in an export) or question IDs. "
+                "An optional 'Submitted At' column keeps the original submission times. "
+                "Separate checkbox selections with ';'. Re-uploading the same file "
+                "resumes an interrupted import."
+            )
+            uploaded = st.file_uploader("CSV file", type=['csv'], key=f"import_file_{form['id']}")
+            
+            import_col, close_col = st.columns([1, 1])
+            with close_col:
+                if st.button("Close", key=f"close_import_{form['id']}"):
+                    st.session_state.import_form_id = None
+                    st.rerun()
+            with import_col:
+                start_import = st.button("Import", key=f"import_{form['id']}")
+            
+            if uploaded is None or not start_import:
+                return
+            
+            progress_bar = st.progress(0.0)
+            status = st.empty()
+            
+            def report(checkpoint):
+                progress_bar.progress(min(checkpoint['rows_done'] / max(checkpoint['rows_total'], 1), 1.0))
+                status.write(f"Imported {checkpoint['imported']} rows, rejected {checkpoint['rejected']}")
+            
+            try:
+                # The importer needs pandas; load it only when an import runs
+                from src.services.import_service import ResponseImporter
+                
+                importer = ResponseImporter(self.supabase, st.secrets.get('IMPORT_CHECKPOINT_DIR', '.import_checkpoints'))
+                result = importer.import_csv(form['id'], uploaded, progress=report)
+            except Exception as e:
+                st.error(f"Error importing responses: {e}")
+                return
+            
+            progress_bar.progress(1.0)
+            st.success(f"Import finished: {result['imported']} rows imported, {result['rejected']} rejected.")
+            for error in result['errors']:
+                st.write(f"Row {error['row']}: {'; '.join(error['errors'])}")
+            
+            # Imported responses should show up on the dashboard right away
+            DashboardService(self.supabase).invalidate(self.session.user.id)
+
     def render_page(self):
         """
         Main page rendering method
@@ -205,11 +227,18 @@ class MyFormsPage:
                     
                     with col2:
                         st.write(f"Public: {'Yes' if form['is_public'] else 'No'}")
-                        st.write(f"Responses: {len(form['responses'])}")
+                        st.write(f"Responses: {form['response_count']}")
                     
                     with col3:
-                        if st.button("View Details", key=f"details_{form['id']}"):
-                            self.render_form_details_modal(form)
+                        show_details = st.button("View Details", key=f"details_{form['id']}")
+                        if st.button("Import CSV", key=f"open_import_{form['id']}"):
+                            st.session_state.import_form_id = form['id']
+                        if show_details:
+                            self.render_form_details_modal(self.load_form_details(form))
+                    
+                    # The importer is rendered for the selected form only
+                    if st.session_state.get('import_form_id') == form['id']:
+                        self.render_import_section(form)
         
         st.markdown("---")
         if st.button("Create New Form", use_container_width=True):
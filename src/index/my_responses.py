@@ -1,93 +1,62 @@
 import streamlit as st
-from src.config.supabase_client import get_supabase_client
+from src.config.supabase_client import get_supabase_client, get_session
+from src.services.response_service import ResponseService
+from src.services.user_directory import UserDirectory
 from datetime import datetime
 
+# Number of responses loaded per page
+RESPONSES_PAGE_SIZE = 20
+
 class MyResponsesPage:
     def __init__(self):
         """
         Initialize Supabase client and set up the page
         """
         self.supabase = get_supabase_client()
+        self.response_service = ResponseService(self.supabase)
+        self.user_directory = UserDirectory(self.supabase)
+        self.session = get_session()
     
-    def get_user_responses(self, user_id=None):
+    def get_user_responses(self, user_id=None, cursor=None):
         """
-        Retrieve all responses for a given user
+        Retrieve one page of responses submitted by a given user
         
         Args:
             user_id (str, optional): ID of the user. If None, use current logged-in user.
+            cursor (tuple, optional): Keyset cursor returned with the previous page
         
         Returns:
-            List of responses with form and answer details
+            Dict with the page of responses (with form and answer details) and the next cursor
         """
         try:
-            # Fetch responses for the user
-            responses_query = (
-                self.supabase.table('responses')
-                .select('id, form_id, created_at, is_anon')
-                .execute()
-            )
+            if user_id is None:
+                if not self.session:
+                    return {'responses': [], 'next_cursor': None}
+                user_id = self.session.user.id
+
+            # Responses, forms, answers and questions in one request
+            page = self.response_service.get_user_responses(user_id, cursor, RESPONSES_PAGE_SIZE)
+            responses = page['responses']
             
-            responses = responses_query.data or []
+            # Resolve all creator names in one batched lookup
+            creator_names = self.user_directory.get_display_names(
+                response['form']['creator_id'] for response in responses if response.get('form')
+            )
             
-            # Enrich responses with form details
             for response in responses:
-                # Get form details
-                form_query = (
-                    self.supabase.table('forms')
-                    .select('id, creator_id')
-                    .eq('id', response['form_id'])
-                    .execute()
-                )
-                
-                if form_query.data:
-                    form = form_query.data[0]
-                    response['form'] = form
-                    
-                    # Get creator details
-                    creator_query = (
-                        self.supabase.table('user_info')
-                        .select('first_name, last_name, email')
-                        .eq('id', form['creator_id'])
-                        .execute()
-                    )
-                    
-                    if creator_query.data:
-                        creator = creator_query.data[0]
-                        response['creator_name'] = (
-                            f"{creator.get('first_name', '')} {creator.get('last_name', '')}".strip() or 
-                            creator.get('email', 'Unknown Creator')
-                        )
-                
-                # Get response answers
-                answers_query = (
-                    self.supabase.table('response_answers')
-                    .select('question_id, answer_value, checkbox_value')
-                    .eq('response_id', response['id'])
-                    .execute()
-                )
-                
-                # Get questions for this form
-                questions_query = (
-                    self.supabase.table('questions')
-                    .select('id, questions_text, question_type')
-                    .eq('form_id', response['form_id'])
-                    .order('order_number')
-                    .execute()
-                )
-                
-                response['answers'] = answers_query.data or []
-                response['questions'] = {q['id']: q for q in (questions_query.data or [])}
+                if response.get('form'):
+                    response['creator_name'] = creator_names.get(response['form']['creator_id'], 'Unknown Creator')
                 
                 # Format timestamp
                 created_at = datetime.fromisoformat(response['created_at'].replace('Z', '+00:00'))
                 response['formatted_date'] = created_at.strftime("%B %d, %Y")
                 response['formatted_time'] = created_at.strftime("%I:%M %p")
             
-            return responses
+            return page
         
         except Exception as e:
             st.error(f"Error fetching responses: {e}")
-            return []
+            return {'responses': [], 'next_cursor': None}
 
 def render_page():
     """
@@ -98,8 +67,12 @@ def render_page():
     # Create an instance of MyResponsesPage
     responses_service = MyResponsesPage()
     
-    # Fetch user responses
-    responses = responses_service.get_user_responses()
+    # Pages loaded so far are kept across reruns; only new pages are fetched
+    if 'my_responses' not in st.session_state:
+        st.session_state.my_responses = responses_service.get_user_responses()
+    
+    responses = st.session_state.my_responses['responses']
+    next_cursor = st.session_state.my_responses['next_cursor']
     
     if not responses:
         st.info("You haven't submitted any form responses yet.")
@@ -135,6 +108,14 @@ def render_page():
             
             # Add a divider between responses
             st.markdown("---")
+    
+    if next_cursor and st.button("Load More", use_container_width=True):
+        page = responses_service.get_user_responses(cursor=next_cursor)
+        st.session_state.my_responses = {
+            'responses': responses + page['responses'],
+            'next_cursor': page['next_cursor']
+        }
+        st.rerun()
 
 # This allows the page to be imported and used in the main app
 if __name__ == "__main__":
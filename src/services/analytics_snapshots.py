@@ -0,0 +1,363 @@
+import copy
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+from supabase import Client
+from src.services.response_frame import build_response_frame
+from src.services.response_service import PAGE_SIZE, ResponseService, keyset_filter
+
+# Number of bins used for numeric answer histograms
+NUMBER_BINS = 10
+
+# Question types whose answers are summarised as option counts
+CHOICE_TYPES = ('multiple_choice', 'dropdown')
+
+# Hour boundaries and labels for the time of day breakdown
+TIME_OF_DAY_BINS = [0, 6, 12, 18, 22, 24]
+TIME_OF_DAY_LABELS = ['Night', 'Morning', 'Afternoon', 'Evening', 'Night']
+
+# Process-wide cache of snapshots keyed by (creator id, form id). Entries
+# are only added after the creator saved the snapshot under RLS, so a
+# cached snapshot is never served to another user.
+_snapshot_cache = LRUCache(maxsize=256)
+_snapshot_cache_lock = threading.Lock()
+
+
+def to_numeric(values: pd.Series) -> pd.Series:
+    """
+    Parse answer values as numbers, NaN where they are not numeric
+
+    Dictionary-encoded values are parsed once per distinct value.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.to_numeric(values, errors='coerce')
+    parsed = pd.to_numeric(pd.Series(values.cat.categories, dtype=object), errors='coerce').to_numpy(dtype=float)
+    codes = values.cat.codes.to_numpy()
+    numbers = np.full(len(codes), np.nan)
+    numbers[codes >= 0] = parsed[codes[codes >= 0]]
+    return pd.Series(numbers, index=values.index)
+
+
+def empty_snapshot(form_id: str) -> Dict[str, Any]:
+    """
+    Snapshot of a form that has not folded in any responses yet
+    """
+    return {
+        'form_id': form_id,
+        'watermark_xid': None,
+        'aggregates': {'daily': {}}
+    }
+
+
+def empty_bucket() -> Dict[str, Any]:
+    """
+    Aggregates for a single UTC day
+    """
+    return {
+        'responses': 0,
+        'anonymous': 0,
+        'hours': [0] * 24,
+        'answered': {},
+        'options': {},
+        'numbers': {}
+    }
+
+
+def compute_daily_aggregates(questions: List[Dict[str, Any]], responses: pd.DataFrame, answers: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate a batch of responses into per-day buckets
+
+    Every count is produced by a grouped pandas operation over the whole
+    batch; only the (small) grouped results are walked in Python. Id and
+    value columns may be categoricals, as produced by ResponseFrame.
+
+    Args:
+        questions (list): Question rows of the form
+        responses (DataFrame): Responses with id, UTC created_at and is_anon
+        answers (DataFrame): Answers with response_id, question_id and values
+
+    Returns:
+        dict: Bucket per 'YYYY-MM-DD' day
+    """
+    daily = {}
+    if responses.empty:
+        return daily
+
+    def bucket(day):
+        if day not in daily:
+            daily[day] = empty_bucket()
+        return daily[day]
+
+    days = responses['created_at'].dt.strftime('%Y-%m-%d')
+    for day, count in days.value_counts().items():
+        bucket(day)['responses'] = int(count)
+    for day, count in days[responses['is_anon']].value_counts().items():
+        bucket(day)['anonymous'] = int(count)
+    for (day, hour), count in pd.DataFrame({'day': days, 'hour': responses['created_at'].dt.hour}).value_counts().items():
+        bucket(day)['hours'][int(hour)] = int(count)
+
+    answers = answers.assign(day=answers['response_id'].astype(object).map(pd.Series(days.to_numpy(), index=responses['id'])))
+
+    for (day, question_id), count in answers.groupby(['day', 'question_id'], observed=True)['response_id'].nunique().items():
+        bucket(day)['answered'][question_id] = int(count)
+
+    ids_by_type = {}
+    for question in questions:
+        ids_by_type.setdefault(question['question_type'], []).append(question['id'])
+    choice_ids = [qid for q_type in CHOICE_TYPES for qid in ids_by_type.get(q_type, [])]
+
+    choice = answers[answers['question_id'].isin(choice_ids)].dropna(subset=['answer_value'])
+    checkbox = (
+        answers.loc[answers['question_id'].isin(ids_by_type.get('checkbox', [])), ['day', 'question_id', 'checkbox_value']]
+        .explode('checkbox_value')
+        .dropna(subset=['checkbox_value'])
+        .rename(columns={'checkbox_value': 'answer_value'})
+    )
+    options = pd.concat([choice[['day', 'question_id', 'answer_value']].astype(object), checkbox.astype(object)])
+    for (day, question_id, option), count in options.groupby(['day', 'question_id', 'answer_value']).size().items():
+        bucket(day)['options'].setdefault(question_id, {})[option] = int(count)
+
+    numbers = answers.loc[answers['question_id'].isin(ids_by_type.get('number', [])), ['day', 'question_id']]
+    numbers = numbers.assign(value=to_numeric(answers['answer_value'])).dropna(subset=['value'])
+    stats = numbers.groupby(['day', 'question_id'], observed=True)['value'].agg(['count', 'sum', 'min', 'max'])
+    for (day, question_id), row in stats.iterrows():
+        bucket(day)['numbers'][question_id] = {
+            'count': int(row['count']),
+            'sum': float(row['sum']),
+            'min': float(row['min']),
+            'max': float(row['max']),
+            'values': {}
+        }
+    # Counts per distinct value keep the median and histogram exact
+    for (day, question_id, value), count in numbers.groupby(['day', 'question_id', 'value'], observed=True).size().items():
+        bucket(day)['numbers'][question_id]['values'][repr(float(value))] = int(count)
+
+    return daily
+
+
+def merge_daily_aggregates(base: Dict[str, Dict[str, Any]], delta: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fold a batch of per-day buckets into existing ones (in place)
+    """
+    for day, new in delta.items():
+        current = base.setdefault(day, empty_bucket())
+        current['responses'] += new['responses']
+        current['anonymous'] += new['anonymous']
+        current['hours'] = [a + b for a, b in zip(current['hours'], new['hours'])]
+
+        for question_id, count in new['answered'].items():
+            current['answered'][question_id] = current['answered'].get(question_id, 0) + count
+
+        for question_id, counts in new['options'].items():
+            target = current['options'].setdefault(question_id, {})
+            for option, count in counts.items():
+                target[option] = target.get(option, 0) + count
+
+        for question_id, stats in new['numbers'].items():
+            existing = current['numbers'].get(question_id)
+            if existing is None:
+                current['numbers'][question_id] = {**stats, 'values': dict(stats['values'])}
+            else:
+                existing['count'] += stats['count']
+                existing['sum'] += stats['sum']
+                existing['min'] = min(existing['min'], stats['min'])
+                existing['max'] = max(existing['max'], stats['max'])
+                for value, count in stats['values'].items():
+                    existing['values'][value] = existing['values'].get(value, 0) + count
+    return base
+
+
+def summarize_numbers(number: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Count, mean, min, max, median and histogram of a number question
+
+    The median and histogram come from the per-value counts, so they are
+    exact for any window of days.
+    """
+    values = np.array([float(value) for value in number['values']])
+    counts = np.array(list(number['values'].values()))
+    order = np.argsort(values)
+    values, counts = values[order], counts[order]
+
+    # Middle positions (1-based) of the sorted answers; equal for odd counts
+    cumulative = np.cumsum(counts)
+    total = int(cumulative[-1])
+    lower = values[np.searchsorted(cumulative, (total + 1) // 2)]
+    upper = values[np.searchsorted(cumulative, total // 2 + 1)]
+
+    hist, edges = np.histogram(values, bins=NUMBER_BINS, weights=counts)
+    return {
+        'count': number['count'],
+        'sum': number['sum'],
+        'mean': number['sum'] / number['count'],
+        'min': number['min'],
+        'max': number['max'],
+        'median': float((lower + upper) / 2),
+        'histogram': {'counts': [int(count) for count in hist], 'edges': edges.tolist()}
+    }
+
+
+def summarize_daily_aggregates(questions: List[Dict[str, Any]], daily: Dict[str, Dict[str, Any]], since: Optional[pd.Timestamp] = None) -> Dict[str, Any]:
+    """
+    Combine per-day buckets into the analytics shape used by the page
+
+    Windows are resolved at day granularity: a bucket is included when
+    its UTC day is on or after the day of `since`.
+    """
+    first_day = since.strftime('%Y-%m-%d') if since is not None else None
+    days = sorted(day for day in daily if first_day is None or day >= first_day)
+    window = {'all': empty_bucket()}
+    for day in days:
+        merge_daily_aggregates(window, {'all': daily[day]})
+    total = window['all']
+
+    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    if days:
+        timeline = pd.Series({pd.Timestamp(day, tz='UTC'): daily[day]['responses'] for day in days}, name='responses')
+        timeline = timeline.reindex(pd.date_range(timeline.index.min(), timeline.index.max(), freq='D'), fill_value=0)
+    else:
+        timeline = pd.Series(dtype='int64', name='responses')
+
+    time_of_day = dict.fromkeys(TIME_OF_DAY_LABELS, 0)
+    for start, end, label in zip(TIME_OF_DAY_BINS, TIME_OF_DAY_BINS[1:], TIME_OF_DAY_LABELS):
+        time_of_day[label] += sum(total['hours'][start:end])
+
+    question_results = []
+    for question in questions:
+        options = total['options'].get(question['id'], {})
+        number = total['numbers'].get(question['id'])
+        question_results.append({
+            'id': question['id'],
+            'text': question['questions_text'],
+            'type': question['question_type'],
+            'answered': total['answered'].get(question['id'], 0),
+            'distribution': dict(sorted(options.items(), key=lambda item: item[1], reverse=True)),
+            'number_stats': summarize_numbers(number) if number and number['count'] else None
+        })
+
+    return {
+        'totals': {
+            'total_responses': total['responses'],
+            'anonymous_responses': total['anonymous'],
+            'responses_today': daily.get(today, {}).get('responses', 0),
+            'first_response': pd.Timestamp(days[0], tz='UTC') if days else None,
+            'last_response': pd.Timestamp(days[-1], tz='UTC') if days else None
+        },
+        'timeline': timeline,
+        'time_of_day': time_of_day,
+        'questions': question_results
+    }
+
+
+class AnalyticsSnapshotService:
+    """
+    Keeps persisted per-form aggregate snapshots up to date.
+
+    A snapshot stores per-day aggregates plus the transaction xmin it was
+    refreshed up to, so each refresh only reads responses inserted by
+    transactions that finished since.
+    """
+
+    def __init__(self, supabase_client: Client):
+        self.supabase = supabase_client
+        self.response_service = ResponseService(supabase_client)
+
+    def load_snapshot(self, form_id: str, creator_id: str) -> Dict[str, Any]:
+        """
+        Load a creator's form snapshot from the process cache or the database
+        """
+        with _snapshot_cache_lock:
+            cached = _snapshot_cache.get((creator_id, form_id))
+        if cached is not None:
+            return cached
+
+        response = (
+            self.supabase.table('form_analytics_snapshots')
+            .select('form_id, watermark_xid, aggregates')
+            .eq('form_id', form_id)
+            .execute()
+        )
+        return response.data[0] if response.data else empty_snapshot(form_id)
+
+    def save_snapshot(self, snapshot: Dict[str, Any], creator_id: str) -> None:
+        """
+        Persist a snapshot and keep it in the process cache
+        """
+        self.supabase.table('form_analytics_snapshots').upsert({
+            **snapshot,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }).execute()
+
+        with _snapshot_cache_lock:
+            _snapshot_cache[(creator_id, snapshot['form_id'])] = snapshot
+
+    def refresh_snapshot(self, form_id: str, creator_id: str, questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Fold responses committed since the snapshot's watermark into it
+
+        Reads the responses whose inserting transaction lies between the
+        watermark and the current snapshot xmin. Every such transaction has
+        finished, so no response is skipped however late it commits. Rows
+        are read in (inserted_xid, id) pages, so memory use is bounded by
+        the page size even on the first refresh.
+        """
+        snapshot = self.load_snapshot(form_id, creator_id)
+        # Fold into a copy so a failed save never leaves the cached
+        # snapshot ahead of its watermark
+        daily = copy.deepcopy(snapshot['aggregates']['daily'])
+        low = snapshot['watermark_xid']
+        high = self.supabase.rpc('responses_snapshot_xmin').execute().data
+        cursor = None
+
+        while True:
+            query = (
+                self.supabase.table('responses')
+                .select('id, created_at, is_anon, inserted_xid')
+                .eq('form_id', form_id)
+                .lt('inserted_xid', high)
+            )
+            if low:
+                query = query.gte('inserted_xid', low)
+            if cursor:
+                query = query.or_(keyset_filter(cursor, column='inserted_xid', descending=False))
+
+            rows = query.order('inserted_xid').order('id').limit(PAGE_SIZE).execute().data or []
+            if not rows:
+                break
+
+            # Answers go straight into dictionary-encoded Arrow columns
+            frame = build_response_frame(rows, self.response_service.iter_answer_chunks(r['id'] for r in rows))
+            delta = compute_daily_aggregates(questions, frame.responses_frame(), frame.answers_frame())
+            merge_daily_aggregates(daily, delta)
+            cursor = (rows[-1]['inserted_xid'], rows[-1]['id'])
+
+        # Nothing new: keep the old watermark rather than writing the row
+        if cursor is not None:
+            snapshot = {
+                'form_id': form_id,
+                'watermark_xid': high,
+                'aggregates': {'daily': daily}
+            }
+            self.save_snapshot(snapshot, creator_id)
+
+        return snapshot
+
+    def get_form_analytics(self, form_id: str, creator_id: str, since: Optional[pd.Timestamp] = None) -> Dict[str, Any]:
+        """
+        Refresh a form's snapshot and summarise it for the selected window
+
+        Args:
+            form_id (str): ID of the form
+            creator_id (str): ID of the signed-in creator, part of the cache key
+            since (Timestamp, optional): Start of the window
+
+        Returns:
+            dict: 'totals', 'timeline', 'time_of_day' and 'questions' analytics
+        """
+        questions = self.response_service.get_form_questions(form_id)
+        snapshot = self.refresh_snapshot(form_id, creator_id, questions)
+        return summarize_daily_aggregates(questions, snapshot['aggregates']['daily'], since)
@@ -0,0 +1,164 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+# Question types whose answers must be one of the question's options
+SINGLE_CHOICE_TYPES = ('multiple_choice', 'dropdown')
+
+# Separator accepted between checkbox selections in flat (e.g. CSV) values
+CHECKBOX_SEPARATOR = ';'
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """
+    Coerce a number answer to float, or None if it is not numeric
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_blank(value: Any) -> bool:
+    """
+    Whether an answer value counts as unanswered
+    """
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    if isinstance(value, (list, tuple)):
+        return len(value) == 0
+    if isinstance(value, float):
+        # Missing cells in a DataFrame are NaN
+        return value != value
+    return False
+
+
+class AnswerValidator:
+    """
+    Validates submissions against a form's questions.
+
+    Everything derived from the question list (required ids, option sets,
+    number questions) is computed once, so one submission is checked in
+    O(answers) and a batch in one vectorized pass per question.
+    """
+
+    def __init__(self, questions: Iterable[Dict[str, Any]]):
+        self.questions = {question['id']: question for question in questions}
+        self.required = frozenset(qid for qid, q in self.questions.items() if q.get('is_required'))
+        self.options = {
+            qid: frozenset(q.get('options') or ())
+            for qid, q in self.questions.items()
+            if q['question_type'] in SINGLE_CHOICE_TYPES or q['question_type'] == 'checkbox'
+        }
+        self.checkbox = frozenset(qid for qid, q in self.questions.items() if q['question_type'] == 'checkbox')
+        self.numbers = frozenset(qid for qid, q in self.questions.items() if q['question_type'] == 'number')
+
+    def label(self, question_id: str) -> str:
+        """
+        Question text used in error messages
+        """
+        question = self.questions.get(question_id)
+        return question['questions_text'] if question else question_id
+
+    def check_value(self, question_id: str, value: Any) -> Optional[str]:
+        """
+        Check one non-blank value, returning an error message or None
+        """
+        if question_id in self.numbers:
+            if parse_number(value) is None:
+                return f"'{self.label(question_id)}' must be a number"
+        elif question_id in self.checkbox:
+            invalid = [option for option in value if option not in self.options[question_id]]
+            if invalid:
+                return f"'{self.label(question_id)}' has invalid options: {', '.join(map(str, invalid))}"
+        elif question_id in self.options:
+            if value not in self.options[question_id]:
+                return f"'{self.label(question_id)}' has an invalid option: {value}"
+        return None
+
+    def validate(self, answers: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Validate one submission
+
+        Args:
+            answers (iterable): Answer dicts with question_id and answer_value/checkbox_value
+
+        Returns:
+            list: Error messages; empty if the submission is valid
+        """
+        errors = []
+        answered = set()
+
+        for answer in answers:
+            question_id = answer['question_id']
+            if question_id not in self.questions:
+                errors.append(f"Unknown question: {question_id}")
+                continue
+
+            value = answer.get('checkbox_value') if question_id in self.checkbox else answer.get('answer_value')
+            if is_blank(value):
+                continue
+            answered.add(question_id)
+
+            error = self.check_value(question_id, value)
+            if error:
+                errors.append(error)
+
+        for question_id in self.required - answered:
+            errors.append(f"'{self.label(question_id)}' is required")
+        return errors
+
+    def validate_batch(self, frame) -> Dict[Any, List[str]]:
+        """
+        Validate many submissions at once
+
+        Args:
+            frame (DataFrame): One row per submission and one column per
+                question id. Checkbox cells hold lists or
+                CHECKBOX_SEPARATOR-joined strings.
+
+        Returns:
+            dict: Error messages keyed by the frame index of each invalid row
+        """
+        # pandas is only needed for bulk validation; keep it off the fill path
+        import pandas as pd
+
+        unknown = [column for column in frame.columns if column not in self.questions]
+        if unknown:
+            raise ValueError(f"Unknown question columns: {', '.join(map(str, unknown))}")
+
+        failures = []
+        for question_id in self.questions:
+            label = self.label(question_id)
+            if question_id not in frame.columns:
+                if question_id in self.required:
+                    failures.append((pd.Series(True, index=frame.index), f"'{label}' is required"))
+                continue
+
+            column = frame[question_id]
+            if question_id in self.checkbox:
+                column = column.map(
+                    lambda value: [part.strip() for part in value.split(CHECKBOX_SEPARATOR) if part.strip()]
+                    if isinstance(value, str) else value
+                )
+            blank = column.map(is_blank).astype(bool)
+
+            if question_id in self.required:
+                failures.append((blank, f"'{label}' is required"))
+
+            if question_id in self.numbers:
+                invalid = ~blank & pd.to_numeric(column.where(~blank), errors='coerce').isna()
+                failures.append((invalid, f"'{label}' must be a number"))
+            elif question_id in self.checkbox:
+                selected = column[~blank].explode()
+                invalid_rows = selected[~selected.isin(self.options[question_id])].index.unique()
+                failures.append((frame.index.isin(invalid_rows), f"'{label}' has invalid options"))
+            elif question_id in self.options:
+                invalid = ~blank & ~column.isin(self.options[question_id])
+                failures.append((invalid, f"'{label}' has an invalid option"))
+
+        errors = {}
+        for mask, message in failures:
+            for row in frame.index[mask]:
+                errors.setdefault(row, []).append(message)
+        return errors
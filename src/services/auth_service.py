@@ -1,9 +1,21 @@
-from src.config.supabase_client import get_supabase_client
+from src.config.supabase_client import get_supabase_client, create_auth_client
+from src.services.user_directory import invalidate_user
+from src.utils.auth_utils import clear_auth_state
 import streamlit as st
 
 class AuthService:
     def __init__(self):
         self.supabase = get_supabase_client()
+        self._auth_client = None
+
+    @property
+    def auth_client(self):
+        """
+        Dedicated client for auth flows, created only when one is needed
+        """
+        if self._auth_client is None:
+            self._auth_client = create_auth_client()
+        return self._auth_client
    
     def sign_up(self, email, password, profile_data):
         """
@@ -39,7 +51,7 @@ class AuthService:
             }
             
             # Create user in Supabase Auth
-            response = self.supabase.auth.sign_up(signup_data)
+            response = self.auth_client.auth.sign_up(signup_data)
             
             # If signup is successful, add additional profile data
             if response.user:
@@ -58,7 +70,7 @@ class AuthService:
                 
                 # Insert profile data
                 profile_response = (
-                    self.supabase
+                    self.auth_client
                     .table('user_info')
                     .insert(profile_insert_data)
                     .execute()
@@ -69,7 +81,7 @@ class AuthService:
                     return response.user
                 else:
                     # Rollback user creation if profile insertion fails
-                    self.supabase.auth.admin.delete_user(user_id)
+                    self.auth_client.auth.admin.delete_user(user_id)
                     raise Exception("Failed to create user profile")
             
             return None
@@ -87,7 +99,7 @@ class AuthService:
         """
         try:
             # Attempt to sign in with email and password
-            response = self.supabase.auth.sign_in_with_password({
+            response = self.auth_client.auth.sign_in_with_password({
                 "email": email,
                 "password": password
             })
@@ -112,12 +124,11 @@ class AuthService:
         Sign out the current user
         """
         try:
-            # Remove session from Streamlit state
-            if 'supabase_session' in st.session_state:
-                del st.session_state.supabase_session
+            # Remove session and any pending refresh from Streamlit state
+            clear_auth_state()
             
             # Sign out from Supabase
-            self.supabase.auth.sign_out()
+            self.auth_client.auth.sign_out()
             
             return True
         except Exception as e:
@@ -149,6 +160,8 @@ class AuthService:
                 'id': user_id,
                 **profile_data
             }).execute()
+            # Make sure the new name shows up everywhere right away
+            invalidate_user(user_id)
             return response.data[0] if response.data else None
         except Exception as e:
             st.error(f"Error updating profile: {str(e)}")
@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Any, Dict
+from cachetools import TTLCache
+from supabase import Client
+
+# How often a creator's rollup is recomputed; cached rollups expire after this
+DASHBOARD_REFRESH_SECONDS = 300
+
+# Process-wide rollup cache keyed by creator id
+_rollup_cache = TTLCache(maxsize=1024, ttl=DASHBOARD_REFRESH_SECONDS)
+_rollup_cache_lock = threading.Lock()
+
+
+def empty_rollup() -> Dict[str, Any]:
+    """
+    Rollup of a creator without any forms
+    """
+    return {
+        'forms': [],
+        'monthly': [],
+        'daily': [],
+        'recent_activity': [],
+        'computed_at': time.time()
+    }
+
+
+class DashboardService:
+    def __init__(self, supabase_client: Client):
+        self.supabase = supabase_client
+
+    def get_rollup(self, creator_id: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Retrieve cross-form rollups for a creator
+
+        The rollup is computed by the `creator_dashboard_rollup` database
+        function in a single call and cached for DASHBOARD_REFRESH_SECONDS.
+        The function always rolls up the caller's own forms, so this
+        service must be built on the creator's scoped client.
+
+        Args:
+            creator_id (str): ID of the signed-in form creator, used as the cache key
+            force_refresh (bool): Ignore any cached rollup
+
+        Returns:
+            dict: 'forms', 'monthly', 'daily' and 'recent_activity' rollups
+        """
+        if not force_refresh:
+            with _rollup_cache_lock:
+                cached = _rollup_cache.get(creator_id)
+            if cached is not None:
+                return cached
+
+        response = self.supabase.rpc('creator_dashboard_rollup').execute()
+        rollup = {**empty_rollup(), **(response.data or {})}
+        rollup['computed_at'] = time.time()
+
+        with _rollup_cache_lock:
+            _rollup_cache[creator_id] = rollup
+        return rollup
+
+    def invalidate(self, creator_id: str) -> None:
+        """
+        Drop a creator's cached rollup
+        """
+        with _rollup_cache_lock:
+            _rollup_cache.pop(creator_id, None)
@@ -0,0 +1,202 @@
+import csv
+import io
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple
+import pyarrow as pa
+import pyarrow.parquet as pq
+from supabase import Client
+from src.services.response_service import PAGE_SIZE, ResponseService
+
+# Separator used to flatten checkbox selections into one cell
+CHECKBOX_SEPARATOR = '; '
+
+# Finished exports wait here until they are downloaded
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), 'flockiq-exports')
+
+# Exports never downloaded (closed tab, expired session) are removed after this long
+EXPORT_MAX_AGE_SECONDS = 3600
+
+EXPORT_FORMATS = {
+    'CSV': {'extension': 'csv', 'mime': 'text/csv'},
+    'Parquet': {'extension': 'parquet', 'mime': 'application/vnd.apache.parquet'}
+}
+
+
+def question_columns(questions: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    Map each question to a unique column name based on its text
+
+    Returns:
+        list: (question_id, column name) pairs in question order
+    """
+    columns = []
+    seen = set()
+    for idx, question in enumerate(questions, 1):
+        name = (question.get('questions_text') or '').strip() or f"Question {idx}"
+        if name in seen:
+            name = f"{name} ({idx})"
+        seen.add(name)
+        columns.append((question['id'], name))
+    return columns
+
+
+def create_export_file(extension: str) -> str:
+    """
+    Create an empty file for a new export in EXPORT_DIR, removing stale ones
+
+    Returns:
+        str: Path of the new file
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    remove_stale_exports()
+    fd, path = tempfile.mkstemp(suffix=f".{extension}", dir=EXPORT_DIR)
+    os.close(fd)
+    return path
+
+
+def remove_export_file(path: str) -> None:
+    """
+    Delete an export file if it still exists
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def remove_stale_exports(max_age: float = EXPORT_MAX_AGE_SECONDS) -> None:
+    """
+    Delete exports older than `max_age` seconds that were never downloaded
+    """
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            # Removed by another session in the meantime
+            continue
+
+
+class ResponseExporter:
+    """
+    Streams a form's responses as one row per response with one column per
+    question, reading and writing a fixed-size page at a time.
+    """
+
+    def __init__(self, supabase_client: Client, page_size: int = PAGE_SIZE):
+        self.supabase = supabase_client
+        self.response_service = ResponseService(supabase_client)
+        self.page_size = page_size
+
+    def iter_row_pages(self, form_id: str, columns: List[Tuple[str, str]]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of pivoted rows for a form
+
+        Args:
+            form_id (str): ID of the form
+            columns (list): (question_id, column name) pairs to pivot into
+
+        Yields:
+            list: Rows keyed by 'Response ID', 'Submitted At', 'Anonymous'
+                  and one column name per question
+        """
+        column_by_question = dict(columns)
+
+        for responses in self.response_service.iter_response_pages(form_id, self.page_size):
+            rows = {}
+            for response in responses:
+                row = {
+                    'Response ID': response['id'],
+                    'Submitted At': datetime.fromisoformat(response['created_at'].replace('Z', '+00:00')),
+                    'Anonymous': bool(response.get('is_anon'))
+                }
+                row.update(dict.fromkeys(column_by_question.values()))
+                rows[response['id']] = row
+
+            for answers in self.response_service.iter_answer_chunks(rows):
+                for answer in answers:
+                    column = column_by_question.get(answer['question_id'])
+                    if column is None:
+                        continue
+                    if answer.get('checkbox_value') is not None:
+                        value = CHECKBOX_SEPARATOR.join(answer['checkbox_value'])
+                    else:
+                        value = answer.get('answer_value')
+                    rows[answer['response_id']][column] = value
+
+            yield list(rows.values())
+
+    def write_csv(self, form_id: str, fileobj) -> int:
+        """
+        Stream a form's responses to a text file object as CSV
+
+        Returns:
+            int: Number of responses written
+        """
+        columns = question_columns(self.response_service.get_form_questions(form_id))
+        header = ['Response ID', 'Submitted At', 'Anonymous'] + [name for _, name in columns]
+
+        writer = csv.DictWriter(fileobj, fieldnames=header)
+        writer.writeheader()
+
+        written = 0
+        for rows in self.iter_row_pages(form_id, columns):
+            for row in rows:
+                row['Submitted At'] = row['Submitted At'].isoformat()
+            writer.writerows(rows)
+            written += len(rows)
+        return written
+
+    def write_parquet(self, form_id: str, where) -> int:
+        """
+        Stream a form's responses to a Parquet file, one row group per page
+
+        Args:
+            form_id (str): ID of the form
+            where (str or file object): Destination passed to ParquetWriter
+
+        Returns:
+            int: Number of responses written
+        """
+        columns = question_columns(self.response_service.get_form_questions(form_id))
+        schema = pa.schema(
+            [
+                ('Response ID', pa.string()),
+                ('Submitted At', pa.timestamp('us', tz='UTC')),
+                ('Anonymous', pa.bool_())
+            ]
+            + [(name, pa.string()) for _, name in columns]
+        )
+
+        written = 0
+        with pq.ParquetWriter(where, schema) as writer:
+            for rows in self.iter_row_pages(form_id, columns):
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                written += len(rows)
+            if written == 0:
+                writer.write_table(schema.empty_table())
+        return written
+
+    def export(self, form_id: str, export_format: str, fileobj) -> int:
+        """
+        Export a form's responses to a binary file object in the given format
+
+        Returns:
+            int: Number of responses written
+        """
+        if export_format == 'CSV':
+            text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+            try:
+                written = self.write_csv(form_id, text)
+                text.flush()
+                return written
+            finally:
+                # Leave the caller's file object open
+                text.detach()
+        if export_format == 'Parquet':
+            return self.write_parquet(form_id, fileobj)
+        raise ValueError(f"Unsupported export format: {export_format}")
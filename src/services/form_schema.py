@@ -0,0 +1,117 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from cachetools import LRUCache
+from supabase import Client
+from src.services.user_directory import UserDirectory
+
+# How long a cached schema is trusted before its form's updated_at is re-checked
+FORM_SCHEMA_REVALIDATE_SECONDS = 30
+
+# Process-wide cache of compiled schemas of public forms keyed by form id.
+# Public forms read the same for every viewer; any other form is loaded
+# with the caller's client on every request so row level security applies.
+_schema_cache = LRUCache(maxsize=512)
+_schema_cache_lock = threading.Lock()
+
+
+def invalidate_form_schema(form_id: str) -> None:
+    """
+    Drop a form's cached schema, e.g. after its questions change
+    """
+    with _schema_cache_lock:
+        _schema_cache.pop(form_id, None)
+
+
+def compile_form_schema(form: Dict[str, Any], questions: list, creator_name: str) -> Dict[str, Any]:
+    """
+    Build the schema the Fill Form page renders from
+
+    Questions are kept in order with their options normalised to tuples,
+    and the creation timestamp is formatted once.
+    """
+    created_at = datetime.fromisoformat(form['created_at'].replace('Z', '+00:00'))
+
+    return {
+        'form': form,
+        'questions': tuple(
+            {**question, 'options': tuple(question.get('options') or ())}
+            for question in sorted(questions, key=lambda q: q['order_number'])
+        ),
+        'creator_name': creator_name,
+        'formatted_date': created_at.strftime("%B %d, %Y"),
+        'formatted_time': created_at.strftime("%I:%M %p"),
+        'updated_at': form.get('updated_at'),
+        'checked_at': time.monotonic()
+    }
+
+
+class FormSchemaService:
+    """
+    Serves compiled form schemas, caching those of public forms process-wide.
+
+    A cached schema is reused as is for FORM_SCHEMA_REVALIDATE_SECONDS;
+    after that a single lookup with the caller's client decides whether
+    it is still current and public or has to be rebuilt.
+    """
+
+    def __init__(self, supabase_client: Client):
+        self.supabase = supabase_client
+        self.user_directory = UserDirectory(supabase_client)
+
+    def get_form_schema(self, form_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a form's compiled schema
+
+        Args:
+            form_id (str): ID of the form
+
+        Returns:
+            dict: form, questions, creator_name, formatted_date and
+                  formatted_time, or None if the form does not exist
+        """
+        with _schema_cache_lock:
+            cached = _schema_cache.get(form_id)
+
+        if cached is not None:
+            if time.monotonic() - cached['checked_at'] < FORM_SCHEMA_REVALIDATE_SECONDS:
+                return cached
+
+            response = self.supabase.table('forms').select('updated_at, is_public').eq('id', form_id).execute()
+            if not response.data or not response.data[0]['is_public']:
+                invalidate_form_schema(form_id)
+                return self.load_form_schema(form_id) if response.data else None
+            if response.data[0]['updated_at'] == cached['updated_at']:
+                cached['checked_at'] = time.monotonic()
+                return cached
+
+        return self.load_form_schema(form_id)
+
+    def load_form_schema(self, form_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a form with its questions and creator and compile its schema
+
+        Only schemas of public forms are cached; private forms are visible
+        to some callers only, so they are always read through RLS.
+        """
+        response = (
+            self.supabase.table('forms')
+            .select('*, questions(*)')
+            .eq('id', form_id)
+            .execute()
+        )
+        if not response.data:
+            return None
+
+        form = dict(response.data[0])
+        questions = form.pop('questions', None) or []
+        creator_name = self.user_directory.get_display_name(form['creator_id'])
+        schema = compile_form_schema(form, questions, creator_name)
+
+        if form.get('is_public'):
+            with _schema_cache_lock:
+                _schema_cache[form_id] = schema
+        else:
+            invalidate_form_schema(form_id)
+        return schema
@@ -1,6 +1,14 @@
 import uuid
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from supabase import Client
+from src.services.response_service import keyset_filter
+from src.services.search_index import index_form
+
+# Default number of published forms fetched per page
+PUBLISHED_FORMS_PAGE_SIZE = 20
+
+# Questions sent per database call when creating a form
+QUESTION_CHUNK_SIZE = 500
 
 class FormService:
     def __init__(self, supabase_client: Client):
@@ -10,6 +18,13 @@ class FormService:
         """
         Create a new form with its associated questions
         
+        The form and its first QUESTION_CHUNK_SIZE questions are inserted
+        atomically by the `create_form_with_questions` database function.
+        Larger question sets are appended in further chunks: the form is
+        created unpublished and only made public by the call that appends
+        the last chunk, so respondents never see a partial form. If any
+        chunk fails, the form is deleted again.
+        
         Args:
             creator_id (str): ID of the user creating the form
             form_data (dict): Form details like title, description, etc.
@@ -18,51 +33,70 @@ class FormService:
         Returns:
             dict: Created form details or None if creation fails
         """
-        try:
-            # Start a transaction to ensure atomicity
-            self.supabase.rpc('begin')
-
-            # Insert form
-            form_insert = {
-                'creator_id': creator_id,
-                'is_public': form_data.get('is_public', False),
-                'allow_anon': form_data.get('allow_anonymous', False)
+        question_rows = [
+            {
+                'questions_text': q['text'],
+                'question_type': q['type'],
+                'is_required': q['is_required'],
+                'options': q['options'] if q['options'] else None
             }
-            form_response = self.supabase.table('forms').insert(form_insert).execute()
-            
-            if not form_response.data:
-                raise Exception("Failed to create form")
-            
-            form_id = form_response.data[0]['id']
-
-            # Insert questions for this form
-            questions_to_insert = [
-                {
-                    'form_id': form_id,
-                    'questions_text': q['text'],
-                    'question_type': q['type'],
-                    'is_required': q['is_required'],
-                    'order_number': idx + 1,
-                    'options': q['options'] if q['options'] else None
-                }
-                for idx, q in enumerate(questions)
-            ]
+            for q in questions
+        ]
 
-            questions_response = self.supabase.table('questions').insert(questions_to_insert).execute()
+        is_public = form_data.get('is_public', False)
+        chunked = len(question_rows) > QUESTION_CHUNK_SIZE
+
+        try:
+            result = self.supabase.rpc('create_form_with_questions', {
+                'payload': {
+                    'creator_id': creator_id,
+                    'title': form_data.get('title'),
+                    'description': form_data.get('description'),
+                    'is_public': is_public and not chunked,
+                    'allow_anon': form_data.get('allow_anonymous', False),
+                    'questions': question_rows[:QUESTION_CHUNK_SIZE]
+                }
+            }).execute()
 
-            # Commit transaction
-            self.supabase.rpc('commit')
+            if not result.data:
+                raise Exception("Failed to create form")
+        except Exception as e:
+            print(f"Error creating form: {e}")
+            return None
 
-            return {
-                'form_id': form_id,
-                'questions': questions_response.data
-            }
+        form = result.data['form']
+        created_questions = list(result.data['questions'] or [])
 
+        try:
+            for start in range(QUESTION_CHUNK_SIZE, len(question_rows), QUESTION_CHUNK_SIZE):
+                params = {
+                    'p_form_id': form['id'],
+                    'questions': question_rows[start:start + QUESTION_CHUNK_SIZE],
+                    'start_order': start + 1
+                }
+                # Publish together with the last chunk
+                if start + QUESTION_CHUNK_SIZE >= len(question_rows):
+                    params['p_is_public'] = is_public
+                chunk = self.supabase.rpc('append_form_questions', params).execute()
+                created_questions.extend(chunk.data or [])
+            form['is_public'] = is_public
         except Exception as e:
-            # Rollback transaction in case of failure
-            self.supabase.rpc('rollback')
             print(f"Error creating form: {e}")
+            # Remove the partially created form
+            try:
+                self.supabase.table('questions').delete().eq('form_id', form['id']).execute()
+                self.supabase.table('forms').delete().eq('id', form['id']).execute()
+            except Exception as cleanup_error:
+                print(f"Error removing partially created form {form['id']}: {cleanup_error}")
             return None
+
+        # Make the new form searchable without rebuilding the index
+        index_form(form, created_questions)
+
+        return {
+            'form_id': form['id'],
+            'questions': created_questions
+        }
     
     def get_published_forms(self):
         """
@@ -73,4 +107,45 @@ class FormService:
             return response.data
         except Exception as e:
             print(f"Error fetching published forms: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def get_published_forms_page(self, cursor: Optional[Tuple[str, str]] = None, page_size: int = PUBLISHED_FORMS_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Retrieve one page of published forms, newest first, using keyset pagination
+
+        Args:
+            cursor (tuple, optional): (created_at, id) of the last form on the previous page
+            page_size (int): Maximum number of forms to return
+
+        Returns:
+            dict: 'forms' for this page and 'next_cursor' (None on the last page)
+        """
+        try:
+            query = (
+                self.supabase.table('forms')
+                .select('id, created_at, creator_id')
+                .eq('is_public', True)
+            )
+
+            if cursor:
+                query = query.or_(keyset_filter(cursor))
+
+            # Fetch one extra row to learn whether another page exists
+            response = (
+                query
+                .order('created_at', desc=True)
+                .order('id', desc=True)
+                .limit(page_size + 1)
+                .execute()
+            )
+
+            forms = response.data or []
+            next_cursor = None
+            if len(forms) > page_size:
+                forms = forms[:page_size]
+                next_cursor = (forms[-1]['created_at'], forms[-1]['id'])
+
+            return {'forms': forms, 'next_cursor': next_cursor}
+        except Exception as e:
+            print(f"Error fetching published forms page: {e}")
+            return {'forms': [], 'next_cursor': None}
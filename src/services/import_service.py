@@ -0,0 +1,251 @@
+import hashlib
+import io
+import json
+import os
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+from supabase import Client
+from src.services.answer_validator import CHECKBOX_SEPARATOR, AnswerValidator
+from src.services.export_service import question_columns
+from src.services.response_service import ResponseService, build_submission_payload
+
+# CSV rows validated and inserted per bulk call
+IMPORT_CHUNK_SIZE = 500
+
+# Rejected rows kept in the checkpoint for display
+MAX_REPORTED_ERRORS = 100
+
+# Column (as written by the exporter) that marks anonymous responses
+ANONYMOUS_COLUMN = 'Anonymous'
+
+# Column (as written by the exporter) holding the original submission time;
+# without it imported responses are timestamped when they are stored
+SUBMITTED_AT_COLUMN = 'Submitted At'
+
+# Exporter columns that describe the response rather than a question
+IGNORED_COLUMNS = ('Response ID',)
+
+TRUE_VALUES = ('true', '1', 'yes', 'y')
+
+
+def file_digest(fileobj) -> str:
+    """
+    SHA-256 of a binary file object, read in blocks; the position is reset
+    """
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(1 << 20), b''):
+        digest.update(block)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def map_columns(header: List[str], questions: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Map CSV columns to question ids
+
+    A column matches a question by id or by the column name the exporter
+    uses for it, so exported files can be imported unchanged.
+
+    Returns:
+        dict: question_id keyed by CSV column
+    """
+    by_name = {name: question_id for question_id, name in question_columns(questions)}
+    by_name.update({question['id']: question['id'] for question in questions})
+
+    mapping = {}
+    unknown = []
+    for column in header:
+        if column in by_name:
+            mapping[column] = by_name[column]
+        elif column not in (ANONYMOUS_COLUMN, SUBMITTED_AT_COLUMN) and column not in IGNORED_COLUMNS:
+            unknown.append(column)
+
+    if unknown:
+        raise ValueError(f"Columns do not match any question: {', '.join(unknown)}")
+    if len(set(mapping.values())) < len(mapping):
+        raise ValueError("More than one column maps to the same question")
+    return mapping
+
+
+def parse_submitted_at(chunk: pd.DataFrame) -> Tuple[pd.Series, Dict[Any, List[str]]]:
+    """
+    Parse a chunk's submission times, as written by the exporter or other tools
+
+    Times without a zone are taken as UTC. Blank cells, and chunks without
+    the column, leave the time to the database.
+
+    Returns:
+        tuple: UTC timestamps (NaT where none was given) and error messages
+               keyed by the index of each row with an unusable time
+    """
+    if SUBMITTED_AT_COLUMN not in chunk.columns:
+        return pd.Series(pd.NaT, index=chunk.index, dtype='datetime64[ns, UTC]'), {}
+
+    raw = chunk[SUBMITTED_AT_COLUMN].fillna('').str.strip()
+    parsed = pd.to_datetime(raw.where(raw != ''), utc=True, errors='coerce', format='mixed')
+
+    errors = {}
+    for row_number in raw.index[(raw != '') & parsed.isna()]:
+        errors[row_number] = [f"'{SUBMITTED_AT_COLUMN}' is not a valid date and time"]
+    for row_number in parsed.index[parsed > pd.Timestamp.now(tz='UTC')]:
+        errors[row_number] = [f"'{SUBMITTED_AT_COLUMN}' lies in the future"]
+    return parsed, errors
+
+
+class ResponseImporter:
+    """
+    Imports responses into an existing form from a CSV file.
+
+    The file is read and validated IMPORT_CHUNK_SIZE rows at a time and
+    each chunk of valid rows is stored with one bulk call. After every
+    chunk a checkpoint records how many rows are done, so an interrupted
+    import of the same file resumes after the last stored chunk. Response
+    ids are derived from the file digest and row number, which makes
+    re-sending a chunk harmless.
+    """
+
+    def __init__(self, supabase_client: Client, checkpoint_dir: str, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.supabase = supabase_client
+        self.response_service = ResponseService(supabase_client)
+        self.checkpoint_dir = checkpoint_dir
+        self.chunk_size = chunk_size
+
+    def checkpoint_path(self, form_id: str, digest: str) -> str:
+        """
+        Checkpoint file of one form and file
+        """
+        return os.path.join(self.checkpoint_dir, f"{form_id}-{digest}.json")
+
+    def load_checkpoint(self, form_id: str, digest: str) -> Dict[str, Any]:
+        """
+        Load the progress of a previous import of the same file
+        """
+        path = self.checkpoint_path(form_id, digest)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as fileobj:
+                return json.load(fileobj)
+        return {'rows_done': 0, 'imported': 0, 'rejected': 0, 'errors': [], 'finished': False}
+
+    def save_checkpoint(self, form_id: str, digest: str, checkpoint: Dict[str, Any]) -> None:
+        """
+        Atomically replace the checkpoint file
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = self.checkpoint_path(form_id, digest)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as fileobj:
+            json.dump(checkpoint, fileobj)
+            fileobj.flush()
+            os.fsync(fileobj.fileno())
+        os.replace(f"{path}.tmp", path)
+
+    def build_payloads(self, form_id: str, digest: str, chunk: pd.DataFrame, mapping: Dict[str, str],
+                       validator: AnswerValidator, submitted_at: pd.Series) -> List[Dict[str, Any]]:
+        """
+        Turn the valid rows of a chunk into bulk submission payloads
+
+        Rows with a submission time carry it as 'created_at'.
+        """
+        payloads = []
+        anonymous = (
+            chunk[ANONYMOUS_COLUMN].fillna('').str.strip().str.lower().isin(TRUE_VALUES)
+            if ANONYMOUS_COLUMN in chunk.columns
+            else pd.Series(False, index=chunk.index)
+        )
+        records = chunk[list(mapping)].rename(columns=mapping)
+
+        for row_number, row in zip(records.index, records.itertuples(index=False, name=None)):
+            answers = []
+            for question_id, value in zip(records.columns, row):
+                if not isinstance(value, str) or not value.strip():
+                    continue
+                if question_id in validator.checkbox:
+                    selected = [part.strip() for part in value.split(CHECKBOX_SEPARATOR) if part.strip()]
+                    answers.append({'question_id': question_id, 'checkbox_value': selected})
+                else:
+                    answers.append({'question_id': question_id, 'answer_value': value.strip()})
+
+            payload = build_submission_payload(form_id, answers, is_anon=bool(anonymous[row_number]))
+            payload['response_id'] = str(uuid.uuid5(uuid.NAMESPACE_URL, f"import:{form_id}:{digest}:{row_number}"))
+            if not pd.isna(submitted_at[row_number]):
+                payload['created_at'] = submitted_at[row_number].isoformat()
+            payloads.append(payload)
+        return payloads
+
+    def import_csv(self, form_id: str, fileobj, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Import a CSV file of responses into a form
+
+        Args:
+            form_id (str): ID of the form to import into
+            fileobj: Binary file object holding the CSV
+            progress (callable, optional): Called with the checkpoint after each chunk;
+                checkpoint['rows_total'] is the number of data rows in the file
+
+        Returns:
+            dict: Final checkpoint with rows_done, rows_total, imported,
+                  rejected and the first MAX_REPORTED_ERRORS row errors
+        """
+        questions = self.response_service.get_form_questions(form_id)
+        validator = AnswerValidator(questions)
+        digest = file_digest(fileobj)
+        checkpoint = self.load_checkpoint(form_id, digest)
+        if checkpoint['finished']:
+            return checkpoint
+
+        # pandas closes handles it wraps itself; read through a wrapper we
+        # own and detach it so the caller's file object stays open
+        text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+        try:
+            header = list(pd.read_csv(text, nrows=0, dtype=str).columns)
+            mapping = map_columns(header, questions)
+            text.seek(0)
+
+            # Count parsed rows, not newlines: quoted cells may span lines
+            checkpoint['rows_total'] = sum(
+                len(chunk) for chunk in pd.read_csv(text, dtype=str, usecols=[0], chunksize=self.chunk_size)
+            )
+            text.seek(0)
+
+            rows_read = 0
+            for chunk in pd.read_csv(text, dtype=str, chunksize=self.chunk_size):
+                # Number rows by their position in the file (1-based, after the header)
+                chunk.index = pd.RangeIndex(rows_read + 1, rows_read + 1 + len(chunk))
+                rows_read += len(chunk)
+
+                # Chunks stored by an earlier run are only re-read, not re-sent
+                chunk = chunk.loc[checkpoint['rows_done'] + 1:]
+                if chunk.empty:
+                    continue
+
+                errors = validator.validate_batch(chunk[list(mapping)].rename(columns=mapping))
+                submitted_at, time_errors = parse_submitted_at(chunk)
+                for row_number, messages in time_errors.items():
+                    errors.setdefault(row_number, []).extend(messages)
+                errors = dict(sorted(errors.items()))
+
+                valid = chunk.drop(index=list(errors))
+                if not valid.empty:
+                    self.response_service.submit_responses_bulk(
+                        self.build_payloads(form_id, digest, valid, mapping, validator, submitted_at)
+                    )
+
+                checkpoint['rows_done'] += len(chunk)
+                checkpoint['imported'] += len(valid)
+                checkpoint['rejected'] += len(errors)
+                for row_number, messages in errors.items():
+                    if len(checkpoint['errors']) >= MAX_REPORTED_ERRORS:
+                        break
+                    checkpoint['errors'].append({'row': int(row_number), 'errors': messages})
+                self.save_checkpoint(form_id, digest, checkpoint)
+
+                if progress:
+                    progress(checkpoint)
+        finally:
+            text.detach()
+            fileobj.seek(0)
+
+        checkpoint['finished'] = True
+        self.save_checkpoint(form_id, digest, checkpoint)
+        return checkpoint
@@ -0,0 +1,104 @@
+from typing import Any, Dict, Iterable, List
+import pandas as pd
+import pyarrow as pa
+
+# Strings that repeat across rows (ids, options) are dictionary-encoded:
+# each distinct value is stored once and rows hold int32 indices
+DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+RESPONSES_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('created_at', pa.timestamp('us', tz='UTC')),
+    ('is_anon', pa.bool_())
+])
+
+ANSWERS_SCHEMA = pa.schema([
+    ('response_id', DICTIONARY_STRING),
+    ('question_id', DICTIONARY_STRING),
+    ('answer_value', DICTIONARY_STRING),
+    ('checkbox_value', pa.list_(DICTIONARY_STRING))
+])
+
+
+def responses_batch(rows: List[Dict[str, Any]]) -> pa.RecordBatch:
+    """
+    Convert a page of response rows to an Arrow record batch
+    """
+    created_at = pd.to_datetime([row['created_at'] for row in rows], utc=True, format='ISO8601')
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([row['id'] for row in rows], pa.string()),
+            pa.array(created_at, RESPONSES_SCHEMA.field('created_at').type),
+            pa.array([bool(row.get('is_anon')) for row in rows], pa.bool_())
+        ],
+        schema=RESPONSES_SCHEMA
+    )
+
+
+def answers_batch(rows: List[Dict[str, Any]]) -> pa.RecordBatch:
+    """
+    Convert a chunk of answer rows to an Arrow record batch
+    """
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([row['response_id'] for row in rows], DICTIONARY_STRING),
+            pa.array([row['question_id'] for row in rows], DICTIONARY_STRING),
+            pa.array([row.get('answer_value') for row in rows], DICTIONARY_STRING),
+            pa.array([row.get('checkbox_value') for row in rows], ANSWERS_SCHEMA.field('checkbox_value').type)
+        ],
+        schema=ANSWERS_SCHEMA
+    )
+
+
+class ResponseFrame:
+    """
+    Columnar, Arrow-backed view of a form's responses and answers.
+
+    `responses` has one row per response; `answers` has one row per stored
+    answer with dictionary-encoded ids and option values and a list column
+    for checkbox selections.
+    """
+
+    def __init__(self, responses: pa.Table, answers: pa.Table):
+        self.responses = responses
+        self.answers = answers
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by both tables' buffers
+        """
+        return self.responses.nbytes + self.answers.nbytes
+
+    def responses_frame(self) -> pd.DataFrame:
+        """
+        Responses as a pandas DataFrame
+        """
+        return self.responses.to_pandas()
+
+    def answers_frame(self) -> pd.DataFrame:
+        """
+        Answers as a pandas DataFrame; dictionary columns become categoricals
+        that reuse the Arrow dictionaries
+        """
+        return self.answers.to_pandas()
+
+
+def build_response_frame(responses: List[Dict[str, Any]], answer_chunks: Iterable[List[Dict[str, Any]]]) -> ResponseFrame:
+    """
+    Convert a page of responses and their answers to Arrow tables
+
+    Answer chunks are converted one at a time, so only one chunk of
+    Python dicts is alive at once.
+
+    Args:
+        responses (list): Response rows with id, created_at and is_anon
+        answer_chunks (iterable): Lists of answer rows for those responses
+
+    Returns:
+        ResponseFrame: Columnar responses and answers
+    """
+    answer_batches = [answers_batch(answers) for answers in answer_chunks if answers]
+    # Merge per-batch dictionaries so each column has a single dictionary
+    answers = pa.Table.from_batches(answer_batches, schema=ANSWERS_SCHEMA).unify_dictionaries().combine_chunks()
+    return ResponseFrame(pa.Table.from_batches([responses_batch(responses)], schema=RESPONSES_SCHEMA), answers)
@@ -0,0 +1,293 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from supabase import Client
+
+# Number of ids sent in a single `in_` filter; keeps request URLs well
+# below PostgREST/proxy limits (a uuid is 36 characters)
+ID_CHUNK_SIZE = 200
+
+# Rows fetched per request; PostgREST caps responses at 1000 rows by default
+PAGE_SIZE = 1000
+
+
+def chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Split a list into consecutive chunks of at most `size` items
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def fetch_all(build_query: Callable[[], Any], page_size: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Execute a query page by page until every row has been read
+
+    Stops on an empty page rather than a short one: when PostgREST's
+    max-rows setting is below page_size every page comes back short.
+
+    Args:
+        build_query (callable): Returns a fresh, ordered query builder
+        page_size (int): Rows requested per round trip
+
+    Returns:
+        list: All rows matched by the query
+    """
+    rows = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + page_size - 1).execute()
+        data = page.data or []
+        if not data:
+            return rows
+        rows.extend(data)
+        start += len(data)
+
+
+def keyset_filter(cursor: Tuple[str, str], column: str = 'created_at', descending: bool = True) -> str:
+    """
+    Build an `or_` filter selecting rows after a (timestamp, id) cursor
+
+    Args:
+        cursor (tuple): (timestamp, id) of the last row already read
+        column (str): Timestamp column the rows are ordered by
+        descending (bool): Whether rows are read newest first
+
+    Returns:
+        str: PostgREST logic tree for use with `or_`
+    """
+    timestamp, row_id = cursor
+    op = 'lt' if descending else 'gt'
+    return (
+        f'{column}.{op}."{timestamp}",'
+        f'and({column}.eq."{timestamp}",id.{op}.{row_id})'
+    )
+
+
+def build_submission_payload(form_id: str, answers: List[Dict[str, Any]], is_anon: bool = False, respondent_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the JSON payload accepted by the submission database functions
+    """
+    return {
+        'form_id': form_id,
+        'is_anon': is_anon,
+        'respondent_id': respondent_id,
+        'answers': [
+            {
+                'question_id': answer['question_id'],
+                'answer_value': answer.get('answer_value'),
+                'checkbox_value': answer.get('checkbox_value')
+            }
+            for answer in answers
+        ]
+    }
+
+
+class ResponseService:
+    def __init__(self, supabase_client: Client):
+        self.supabase = supabase_client
+
+    def iter_response_pages(self, form_id: str, page_size: int = PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield a form's responses page by page, oldest first
+
+        Pages are read with a (created_at, id) keyset, so each page costs
+        one indexed query no matter how deep into the form it is.
+        """
+        cursor = None
+        while True:
+            query = (
+                self.supabase.table('responses')
+                .select('id, created_at, is_anon')
+                .eq('form_id', form_id)
+            )
+            if cursor:
+                query = query.or_(keyset_filter(cursor, descending=False))
+
+            # A short page is not the last one if max-rows is below
+            # page_size, so only an empty page ends the scan
+            rows = query.order('created_at').order('id').limit(page_size).execute().data or []
+            if not rows:
+                return
+            yield rows
+            cursor = (rows[-1]['created_at'], rows[-1]['id'])
+
+    def iter_answer_chunks(self, response_ids: Iterable[str]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield answers for many responses, one chunk of response ids at a time
+        """
+        for chunk in chunked(list(response_ids), ID_CHUNK_SIZE):
+            yield fetch_all(
+                lambda: (
+                    self.supabase.table('response_answers')
+                    .select('id, response_id, question_id, answer_value, checkbox_value')
+                    .in_('response_id', chunk)
+                    .order('id')
+                )
+            )
+
+    def get_answers_for_responses(self, response_ids: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load answers for many responses using chunked `in_` queries
+
+        Args:
+            response_ids (iterable): IDs of the responses to load answers for
+
+        Returns:
+            dict: Answers grouped by response_id
+        """
+        response_ids = list(response_ids)
+        answers_by_response = {response_id: [] for response_id in response_ids}
+
+        for answers in self.iter_answer_chunks(response_ids):
+            for answer in answers:
+                answers_by_response[answer['response_id']].append(answer)
+
+        return answers_by_response
+
+    def get_form_questions(self, form_id: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve a form's questions in display order
+        """
+        response = (
+            self.supabase.table('questions')
+            .select('id, questions_text, question_type, options, is_required, order_number')
+            .eq('form_id', form_id)
+            .order('order_number')
+            .execute()
+        )
+        return response.data or []
+
+    def get_form_responses(self, form_id: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve all responses for a form with answers joined to their questions
+
+        Issues one query for the questions, one per page of responses and
+        one per chunk of response ids, regardless of the number of answers.
+
+        Args:
+            form_id (str): ID of the form
+
+        Returns:
+            list: Responses, each with an `answers` list of formatted answers
+        """
+        questions = {q['id']: q for q in self.get_form_questions(form_id)}
+
+        responses = fetch_all(
+            lambda: (
+                self.supabase.table('responses')
+                .select('id, created_at, is_anon, form_id')
+                .eq('form_id', form_id)
+                .order('created_at')
+                .order('id')
+            )
+        )
+
+        answers_by_response = self.get_answers_for_responses(r['id'] for r in responses)
+
+        for response in responses:
+            formatted_answers = []
+            for answer in answers_by_response.get(response['id'], []):
+                question = questions.get(answer['question_id'])
+                if question:
+                    formatted_answers.append({
+                        'question_id': answer['question_id'],
+                        'question_text': question['questions_text'],
+                        'question_type': question['question_type'],
+                        'answer_value': answer.get('answer_value'),
+                        'checkbox_value': answer.get('checkbox_value')
+                    })
+            response['answers'] = formatted_answers
+
+        return responses
+
+    def get_user_responses(self, user_id: str, cursor: Optional[Tuple[str, str]] = None, page_size: int = 20) -> Dict[str, Any]:
+        """
+        Retrieve one page of a user's own responses, newest first
+
+        Forms, answers and questions are embedded in the same request, so a
+        page costs a single round trip.
+
+        Args:
+            user_id (str): ID of the respondent
+            cursor (tuple, optional): (created_at, id) of the last response on the previous page
+            page_size (int): Maximum number of responses to return
+
+        Returns:
+            dict: 'responses' for this page and 'next_cursor' (None on the last page)
+        """
+        query = (
+            self.supabase.table('responses')
+            .select(
+                'id, form_id, created_at, is_anon, '
+                'forms(id, creator_id), '
+                'response_answers(question_id, answer_value, checkbox_value, '
+                'questions(id, questions_text, question_type, order_number))'
+            )
+            .eq('respondent_id', user_id)
+        )
+
+        if cursor:
+            query = query.or_(keyset_filter(cursor))
+
+        # Fetch one extra row to learn whether another page exists
+        result = (
+            query
+            .order('created_at', desc=True)
+            .order('id', desc=True)
+            .limit(page_size + 1)
+            .execute()
+        )
+
+        responses = result.data or []
+        next_cursor = None
+        if len(responses) > page_size:
+            responses = responses[:page_size]
+            next_cursor = (responses[-1]['created_at'], responses[-1]['id'])
+
+        for response in responses:
+            response['form'] = response.pop('forms', None)
+            answers = response.pop('response_answers', None) or []
+            answers.sort(key=lambda a: (a.get('questions') or {}).get('order_number', 0))
+            response['answers'] = answers
+            response['questions'] = {
+                a['question_id']: a['questions'] for a in answers if a.get('questions')
+            }
+
+        return {'responses': responses, 'next_cursor': next_cursor}
+
+    def submit_response(self, form_id: str, answers: List[Dict[str, Any]], is_anon: bool = False, respondent_id: Optional[str] = None) -> str:
+        """
+        Store a response and its answers atomically in one round trip
+
+        Calls the `submit_form_response` database function, which inserts
+        the response row and every answer in a single transaction.
+
+        Args:
+            form_id (str): ID of the form being answered
+            answers (list): Answer dicts with question_id and answer_value/checkbox_value
+            is_anon (bool): Whether the submission is anonymous
+            respondent_id (str, optional): ID of the submitting user; the database
+                links non-anonymous responses to the caller (auth.uid()) regardless
+
+        Returns:
+            str: ID of the created response
+        """
+        payload = build_submission_payload(form_id, answers, is_anon, respondent_id)
+        result = self.supabase.rpc('submit_form_response', {'payload': payload}).execute()
+        if not result.data:
+            raise Exception("Failed to create response entry")
+        return result.data
+
+    def submit_responses_bulk(self, payloads: List[Dict[str, Any]]) -> None:
+        """
+        Store many submissions in one round trip
+
+        Each payload must carry a client-generated 'response_id'; the
+        `submit_form_responses` database function skips ids that already
+        exist, so replaying a batch never duplicates responses.
+
+        Args:
+            payloads (list): Payloads from build_submission_payload plus 'response_id'
+                and, for imports into the caller's own forms, an optional ISO
+                'created_at' submission time
+        """
+        self.supabase.rpc('submit_form_responses', {'payloads': payloads}).execute()
@@ -0,0 +1,293 @@
+import bisect
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from supabase import Client
+from src.services.response_service import ID_CHUNK_SIZE, chunked, fetch_all
+
+# Relative weight of a term depending on where it appears in a form
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'description': 2.0,
+    'question': 1.0
+}
+
+# Full rebuild interval, picks up forms created by other processes
+REBUILD_INTERVAL_SECONDS = 15 * 60
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase word tokens
+    """
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def term_weights(form: Dict[str, Any], questions: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Field-weighted term frequencies of a form's title, description and questions
+    """
+    weights = defaultdict(float)
+    for token in tokenize(form.get('title')):
+        weights[token] += FIELD_WEIGHTS['title']
+    for token in tokenize(form.get('description')):
+        weights[token] += FIELD_WEIGHTS['description']
+    for question in questions:
+        for token in tokenize(question.get('questions_text')):
+            weights[token] += FIELD_WEIGHTS['question']
+    return weights
+
+
+class FormSearchIndex:
+    """
+    In-memory inverted index over published forms.
+
+    Maps each term to the forms containing it (with a field-weighted term
+    frequency) and keeps a sorted vocabulary so prefixes can be expanded
+    with a binary search.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)
+        self._vocabulary = []
+        self._forms = {}
+        self._form_terms = {}
+        self.built_at = 0.0
+
+    def __len__(self):
+        return len(self._forms)
+
+    def add_form(self, form: Dict[str, Any], questions: Iterable[Dict[str, Any]] = ()) -> None:
+        """
+        Index a form (replacing any previous entry for the same id)
+
+        Args:
+            form (dict): Form row; its 'title' and 'description' are indexed
+            questions (iterable): Question rows with 'questions_text'
+        """
+        weights = term_weights(form, questions)
+        with self._lock:
+            self.remove_form(form['id'])
+            self._store_form(form, weights)
+            for term in weights:
+                if len(self._postings[term]) == 1:
+                    bisect.insort(self._vocabulary, term)
+
+    def add_forms(self, forms: Iterable[Dict[str, Any]], questions_by_form: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Index many forms at once, sorting the vocabulary a single time
+
+        Args:
+            forms (iterable): Form rows
+            questions_by_form (dict): Question rows keyed by form id
+        """
+        with self._lock:
+            for form in forms:
+                self.remove_form(form['id'])
+                self._store_form(form, term_weights(form, questions_by_form.get(form['id'], ())))
+            self._vocabulary = sorted(self._postings)
+
+    def _store_form(self, form: Dict[str, Any], weights: Dict[str, float]) -> None:
+        self._forms[form['id']] = form
+        self._form_terms[form['id']] = list(weights)
+        for term, weight in weights.items():
+            self._postings[term][form['id']] = weight
+
+    def remove_form(self, form_id: str) -> None:
+        """
+        Remove a form and its postings from the index
+        """
+        with self._lock:
+            self._forms.pop(form_id, None)
+            for term in self._form_terms.pop(form_id, []):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(form_id, None)
+                if not postings:
+                    del self._postings[term]
+                    idx = bisect.bisect_left(self._vocabulary, term)
+                    if idx < len(self._vocabulary) and self._vocabulary[idx] == term:
+                        del self._vocabulary[idx]
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """
+        Return every indexed term starting with `prefix`
+        """
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\uffff')
+        return self._vocabulary[start:end]
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Find forms matching every word of the query
+
+        All but the last word must match a term exactly; the last word is
+        treated as a prefix so results update while the user is typing.
+        Results are ranked by a field-weighted TF-IDF score.
+
+        Args:
+            query (str): Free text search query
+            limit (int): Maximum number of forms to return
+
+        Returns:
+            list: Matching form rows, best match first
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            total_forms = len(self._forms) or 1
+            scores = None
+
+            for position, token in enumerate(tokens):
+                if position == len(tokens) - 1:
+                    terms = self._expand_prefix(token)
+                else:
+                    terms = [token] if token in self._postings else []
+
+                token_scores = {}
+                for term in terms:
+                    postings = self._postings[term]
+                    idf = math.log(1 + total_forms / len(postings))
+                    for form_id, weight in postings.items():
+                        score = weight * idf
+                        if score > token_scores.get(form_id, 0.0):
+                            token_scores[form_id] = score
+
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        form_id: score + token_scores[form_id]
+                        for form_id, score in scores.items()
+                        if form_id in token_scores
+                    }
+                if not scores:
+                    return []
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [self._forms[form_id] for form_id, _ in ranked]
+
+
+# Process-wide index shared by every session; replaced wholesale by a
+# background rebuild, so readers never wait on one
+_search_index = None
+_search_index_lock = threading.Lock()
+_rebuild_running = False
+
+# Forms indexed while a rebuild is running, replayed into the new index
+_forms_during_rebuild = []
+
+
+def build_search_index(supabase_client: Client) -> FormSearchIndex:
+    """
+    Build a fresh index of every published form and its questions
+    """
+    index = FormSearchIndex()
+
+    forms = fetch_all(
+        lambda: (
+            supabase_client.table('forms')
+            .select('id, creator_id, created_at, updated_at, is_public, allow_anon, title, description')
+            .eq('is_public', True)
+            .order('id')
+        )
+    )
+
+    questions_by_form = defaultdict(list)
+    for chunk in chunked([form['id'] for form in forms], ID_CHUNK_SIZE):
+        questions = fetch_all(
+            lambda: (
+                supabase_client.table('questions')
+                .select('id, form_id, questions_text')
+                .in_('form_id', chunk)
+                .order('id')
+            )
+        )
+        for question in questions:
+            questions_by_form[question['form_id']].append(question)
+
+    index.add_forms(forms, questions_by_form)
+    index.built_at = time.time()
+    return index
+
+
+def _rebuild_search_index(supabase_client: Client) -> None:
+    """
+    Build a new index in the background and swap it in
+    """
+    global _search_index, _rebuild_running
+
+    try:
+        index = build_search_index(supabase_client)
+    except Exception as e:
+        print(f"Error rebuilding search index: {e}")
+        index = None
+
+    with _search_index_lock:
+        if index is not None:
+            for form, questions in _forms_during_rebuild:
+                index.add_form(form, questions)
+            _search_index = index
+        else:
+            # Retry after another full interval rather than on every search
+            _search_index.built_at = time.time()
+        _forms_during_rebuild.clear()
+        _rebuild_running = False
+
+
+def get_search_index(supabase_client: Client) -> FormSearchIndex:
+    """
+    Return the process-wide search index
+
+    The first call builds the index. Once it is older than
+    REBUILD_INTERVAL_SECONDS a rebuild starts in a background thread and
+    the current index keeps serving searches until the new one is ready.
+
+    Args:
+        supabase_client: Client without a user session, since the index
+            is shared by every user and only covers published forms
+    """
+    global _search_index, _rebuild_running
+
+    index = _search_index
+    if index is None:
+        with _search_index_lock:
+            if _search_index is None:
+                _search_index = build_search_index(supabase_client)
+            return _search_index
+
+    if time.time() - index.built_at > REBUILD_INTERVAL_SECONDS and not _rebuild_running:
+        with _search_index_lock:
+            if not _rebuild_running:
+                _rebuild_running = True
+                threading.Thread(
+                    target=_rebuild_search_index, args=(supabase_client,),
+                    name='search-index-rebuild', daemon=True
+                ).start()
+    return index
+
+
+def index_form(form: Dict[str, Any], questions: Iterable[Dict[str, Any]]) -> None:
+    """
+    Add a newly created form to the index if the index has been built
+
+    Private forms are ignored; the index only covers published forms.
+    """
+    if _search_index is None or not form.get('is_public'):
+        return
+    questions = list(questions)
+    with _search_index_lock:
+        if _rebuild_running:
+            _forms_during_rebuild.append((form, questions))
+        _search_index.add_form(form, questions)
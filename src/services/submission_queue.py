@@ -0,0 +1,361 @@
+import atexit
+import fcntl
+import glob
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, List, Optional
+from postgrest.exceptions import APIError
+from src.services.response_service import ResponseService, build_submission_payload
+
+# Submissions sent per bulk insert
+FLUSH_BATCH_SIZE = 500
+
+# Seconds the worker waits for more submissions before flushing
+FLUSH_INTERVAL_SECONDS = 1.0
+
+# Upper bound for the retry delay while the backend is unavailable
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+WAL_SEGMENT_PATTERN = 'segment-*.wal'
+DEAD_LETTER_FILE = 'dead-letter.jsonl'
+
+# Held with an exclusive flock by the process that owns a WAL directory
+LOCK_FILE = 'owner.lock'
+
+# SQLSTATE classes that retrying the same payload can never fix: data
+# exceptions and integrity constraint violations
+PERMANENT_SQLSTATE_CLASSES = ('22', '23')
+
+# Other permanent errors: RLS/privilege violations and PostgREST request errors
+PERMANENT_ERROR_CODES = ('42501',)
+PERMANENT_ERROR_PREFIXES = ('PGRST1',)
+
+# HTTP client errors that are worth retrying
+RETRYABLE_HTTP_STATUSES = (408, 429)
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """
+    Whether the database rejected a payload for good
+
+    Transport errors, timeouts, server errors and anything unrecognised
+    count as transient, so an outage never dead-letters submissions.
+    """
+    if not isinstance(error, APIError):
+        return False
+    code = error.code
+    if isinstance(code, int):
+        # PostgREST sent a non-JSON body; only the HTTP status is known
+        return 400 <= code < 500 and code not in RETRYABLE_HTTP_STATUSES
+    code = str(code or '')
+    return (
+        code[:2] in PERMANENT_SQLSTATE_CLASSES
+        or code in PERMANENT_ERROR_CODES
+        or code.startswith(PERMANENT_ERROR_PREFIXES)
+    )
+
+
+def try_lock(path: str):
+    """
+    Open `path` and take an exclusive, non-blocking flock on it
+
+    Returns:
+        The open lock file, or None if another live process holds it
+    """
+    try:
+        lock = open(path, 'a')
+    except FileNotFoundError:
+        # The directory was just adopted and removed by another process
+        return None
+    try:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return None
+    return lock
+
+
+class SubmissionQueue:
+    """
+    Write-behind queue for form submissions backed by a local write-ahead log.
+
+    `enqueue` appends the submission to the current WAL segment, fsyncs it
+    and returns right away. A background worker seals the segment, sends
+    its submissions to the database in bulk batches and deletes the
+    segment once every batch is stored.
+
+    Every process writes to its own directory under `wal_root`, locked
+    with flock for as long as the process lives. On start, directories
+    whose lock is free belonged to processes that are gone: their
+    segments are adopted and replayed. The bulk insert skips response ids
+    that already exist, so replays never create duplicates.
+    """
+
+    def __init__(self, response_service: ResponseService, wal_root: str,
+                 batch_size: int = FLUSH_BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        self.response_service = response_service
+        self.wal_root = wal_root
+        name = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.wal_dir = os.path.join(wal_root, name)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._pending = deque()
+        self._sealed_segments = []
+        self._segment = None
+        self._segment_path = None
+        self._worker = None
+
+        # Lock the directory under a hidden name first, so no other process
+        # ever sees it unlocked and adopts it
+        staging = os.path.join(wal_root, f".{name}")
+        os.makedirs(staging)
+        self._owner_lock = try_lock(os.path.join(staging, LOCK_FILE))
+        os.rename(staging, self.wal_dir)
+        self._adopt_orphans()
+        self._replay()
+        self._open_segment()
+
+    def _adopt_orphans(self) -> None:
+        """
+        Move segments of WAL directories whose owner has exited into ours
+
+        A directory whose lock is still held belongs to a live process and
+        is left alone. Renames are atomic, so a crash while adopting leaves
+        every segment in one directory or the other.
+        """
+        for directory in sorted(glob.glob(os.path.join(self.wal_root, '*', ''))):
+            directory = os.path.normpath(directory)
+            if directory == os.path.normpath(self.wal_dir):
+                continue
+            lock = try_lock(os.path.join(directory, LOCK_FILE))
+            if lock is None:
+                continue
+            try:
+                for path in sorted(glob.glob(os.path.join(directory, WAL_SEGMENT_PATTERN))):
+                    os.rename(path, os.path.join(self.wal_dir, os.path.basename(path)))
+                shutil.rmtree(directory)
+            finally:
+                lock.close()
+
+    def _replay(self) -> None:
+        """
+        Load submissions from adopted segments
+        """
+        for path in sorted(glob.glob(os.path.join(self.wal_dir, WAL_SEGMENT_PATTERN))):
+            with open(path, 'r', encoding='utf-8') as segment:
+                for line in segment:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self._pending.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-write was never acknowledged
+                        print(f"Skipping unreadable WAL entry in {path}")
+            self._sealed_segments.append(path)
+
+    def _open_segment(self) -> None:
+        """
+        Start a new WAL segment for incoming submissions
+        """
+        self._segment_path = os.path.join(self.wal_dir, f"segment-{time.time_ns():020d}.wal")
+        self._segment = open(self._segment_path, 'a', encoding='utf-8')
+
+    def start(self) -> 'SubmissionQueue':
+        """
+        Start the background flush worker
+        """
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='submission-queue', daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the worker after a final flush attempt
+
+        When nothing is left to store, the process's WAL directory is
+        removed; otherwise it stays for the next process to adopt.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            if self._worker.is_alive():
+                return
+
+        with self._lock:
+            if self._pending or self._sealed_segments:
+                return
+            self._segment.close()
+            shutil.rmtree(self.wal_dir, ignore_errors=True)
+            self._owner_lock.close()
+
+    def enqueue(self, form_id: str, answers: List[Dict[str, Any]], is_anon: bool = False,
+                respondent_id: Optional[str] = None) -> str:
+        """
+        Durably record a submission and return its response id
+
+        Args:
+            form_id (str): ID of the form being answered
+            answers (list): Answer dicts with question_id and answer_value/checkbox_value
+            is_anon (bool): Whether the submission is anonymous
+            respondent_id (str, optional): ID of the submitting user
+
+        Returns:
+            str: Client-generated ID the response will be stored under
+        """
+        payload = build_submission_payload(form_id, answers, is_anon, respondent_id)
+        payload['response_id'] = str(uuid.uuid4())
+        line = json.dumps(payload, separators=(',', ':')) + '\n'
+
+        with self._lock:
+            self._segment.write(line)
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+            self._pending.append(payload)
+            backlog = len(self._pending)
+
+        if backlog >= self.batch_size:
+            self._wakeup.set()
+        return payload['response_id']
+
+    def backlog(self) -> int:
+        """
+        Number of submissions not yet stored in the database
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self) -> None:
+        delay = self.flush_interval
+        while True:
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                delay = self.flush_interval
+            except Exception as e:
+                print(f"Submission flush failed, retrying: {e}")
+                delay = min(max(delay * 2, self.flush_interval), MAX_RETRY_DELAY_SECONDS)
+                if self._stopping.is_set():
+                    return
+                continue
+            if self._stopping.is_set():
+                return
+
+    def flush(self) -> int:
+        """
+        Store every pending submission and delete the segments they came from
+
+        Returns:
+            int: Number of submissions flushed
+        """
+        with self._lock:
+            # Replayed segments without a readable entry still need deleting
+            if not self._pending and not self._sealed_segments:
+                return 0
+            # Seal the active segment; new submissions go to a fresh one
+            self._segment.close()
+            self._sealed_segments.append(self._segment_path)
+            self._open_segment()
+            batch_entries = list(self._pending)
+            self._pending.clear()
+            segments = list(self._sealed_segments)
+
+        flushed = 0
+        try:
+            for start in range(0, len(batch_entries), self.batch_size):
+                self._flush_batch(batch_entries[start:start + self.batch_size])
+                flushed = start + self.batch_size
+        except Exception:
+            # Put back whatever was not stored, ahead of newer submissions
+            with self._lock:
+                self._pending.extendleft(reversed(batch_entries[flushed:]))
+            raise
+
+        with self._lock:
+            for path in segments:
+                if os.path.exists(path):
+                    os.remove(path)
+                if path in self._sealed_segments:
+                    self._sealed_segments.remove(path)
+        return len(batch_entries)
+
+    def _flush_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Store one batch, isolating submissions the database rejects
+
+        A transient error (transport, timeout, server error) is raised so
+        the whole batch is retried later. If the database rejects the batch
+        for good, entries are sent one by one: those rejected for good are
+        moved to the dead-letter file, so a single poison entry never
+        blocks the WAL. A transient error on any entry is raised; entries
+        already stored are skipped by id on the retry.
+        """
+        try:
+            self.response_service.submit_responses_bulk(batch)
+            return
+        except Exception as e:
+            if not is_permanent_error(e):
+                raise
+
+        rejected = []
+        try:
+            for entry in batch:
+                try:
+                    self.response_service.submit_responses_bulk([entry])
+                except Exception as e:
+                    if not is_permanent_error(e):
+                        raise
+                    rejected.append((entry, str(e)))
+        finally:
+            # Record what was rejected before any transient error propagates
+            self._dead_letter(rejected)
+
+    def _dead_letter(self, rejected: List[tuple]) -> None:
+        """
+        Append rejected submissions to the shared dead-letter file
+        """
+        if not rejected:
+            return
+        lines = ''.join(json.dumps({'payload': entry, 'error': reason}) + '\n' for entry, reason in rejected)
+        # One O_APPEND write per flush, so lines from several processes never interleave
+        fd = os.open(os.path.join(self.wal_root, DEAD_LETTER_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, lines.encode('utf-8'))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+# Process-wide queue, created on first use when write-behind mode is enabled
+_submission_queue = None
+_submission_queue_lock = threading.Lock()
+
+
+def get_submission_queue(response_service: ResponseService, wal_root: str) -> SubmissionQueue:
+    """
+    Return the process-wide submission queue, replaying and starting it on first use
+
+    The queue keeps the ResponseService it was created with, so callers
+    should pass one built on the shared (not user-scoped) client.
+    """
+    global _submission_queue
+
+    if _submission_queue is None:
+        with _submission_queue_lock:
+            if _submission_queue is None:
+                queue = SubmissionQueue(response_service, wal_root).start()
+                atexit.register(queue.stop)
+                _submission_queue = queue
+    return _submission_queue
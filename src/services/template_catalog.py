@@ -0,0 +1,135 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+import yaml
+
+# Directory holding catalog.yaml and the per-template question files
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
+
+QUESTION_TYPES = ('short_text', 'long_text', 'multiple_choice', 'dropdown', 'checkbox', 'number', 'date')
+
+# Question types that need a list of options
+OPTION_TYPES = ('multiple_choice', 'dropdown', 'checkbox')
+
+
+@dataclass(frozen=True)
+class TemplateQuestion:
+    text: str
+    type: str
+    is_required: bool
+    options: Optional[Tuple[str, ...]]
+
+    def as_question(self) -> Dict[str, Any]:
+        """
+        Question dict in the shape FormService.create_form expects
+        """
+        return {
+            'text': self.text,
+            'type': self.type,
+            'is_required': self.is_required,
+            'options': list(self.options) if self.options else None
+        }
+
+
+@dataclass(frozen=True)
+class FormTemplate:
+    key: str
+    title: str
+    description: str
+    is_public: bool
+    allow_anonymous: bool
+    questions_file: str
+
+    @property
+    def questions(self) -> Tuple[TemplateQuestion, ...]:
+        """
+        The template's questions, loaded on first access
+        """
+        return load_template_questions(self.questions_file)
+
+    def form_data(self) -> Dict[str, Any]:
+        """
+        Form details in the shape FormService.create_form expects
+        """
+        return {
+            'title': self.title,
+            'description': self.description,
+            'is_public': self.is_public,
+            'allow_anonymous': self.allow_anonymous
+        }
+
+
+def read_yaml(filename: str) -> Dict[str, Any]:
+    """
+    Load a YAML file from the templates directory
+    """
+    with open(os.path.join(TEMPLATES_DIR, filename), 'r', encoding='utf-8') as fileobj:
+        return yaml.safe_load(fileobj) or {}
+
+
+def parse_question(filename: str, idx: int, entry: Dict[str, Any]) -> TemplateQuestion:
+    """
+    Validate one question entry of a template file
+    """
+    where = f"{filename}, question {idx}"
+    text = str(entry.get('text') or '').strip()
+    q_type = entry.get('type')
+    options = entry.get('options')
+
+    if not text:
+        raise ValueError(f"{where}: text cannot be empty")
+    if q_type not in QUESTION_TYPES:
+        raise ValueError(f"{where}: unknown question type {q_type!r}")
+    if q_type in OPTION_TYPES and not options:
+        raise ValueError(f"{where}: {q_type} questions must have options")
+
+    return TemplateQuestion(
+        text=text,
+        type=q_type,
+        is_required=bool(entry.get('is_required', False)),
+        options=tuple(str(option) for option in options) if options else None
+    )
+
+
+@lru_cache(maxsize=None)
+def load_template_questions(filename: str) -> Tuple[TemplateQuestion, ...]:
+    """
+    Parse and validate a template's question file, once per process
+    """
+    entries = read_yaml(filename).get('questions') or []
+    if not entries:
+        raise ValueError(f"{filename}: template has no questions")
+    return tuple(parse_question(filename, idx, entry) for idx, entry in enumerate(entries, 1))
+
+
+@lru_cache(maxsize=1)
+def load_template_catalog() -> Tuple[FormTemplate, ...]:
+    """
+    Parse and validate the template catalog, once per process
+
+    Only the catalog entries are read here; question files are loaded
+    lazily through FormTemplate.questions.
+    """
+    templates = []
+    keys = set()
+    for idx, entry in enumerate(read_yaml('catalog.yaml').get('templates') or [], 1):
+        key = entry.get('key')
+        if not key or key in keys:
+            raise ValueError(f"catalog.yaml, template {idx}: missing or duplicate key {key!r}")
+        if not entry.get('title') or not entry.get('questions_file'):
+            raise ValueError(f"catalog.yaml, template {key}: title and questions_file are required")
+        if not os.path.exists(os.path.join(TEMPLATES_DIR, entry['questions_file'])):
+            raise ValueError(f"catalog.yaml, template {key}: {entry['questions_file']} does not exist")
+        keys.add(key)
+
+        templates.append(FormTemplate(
+            key=key,
+            title=entry['title'],
+            description=entry.get('description') or '',
+            is_public=bool(entry.get('is_public', False)),
+            allow_anonymous=bool(entry.get('allow_anonymous', False)),
+            questions_file=entry['questions_file']
+        ))
+    return tuple(templates)
+
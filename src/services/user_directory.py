@@ -0,0 +1,100 @@
+import threading
+from typing import Any, Dict, Iterable, Optional
+from cachetools import TTLCache
+from supabase import Client
+from src.services.response_service import ID_CHUNK_SIZE, chunked
+
+# Process-wide cache of user_info rows keyed by user id; a cached None
+# marks an id that has no profile so it is not queried again
+_profile_cache = TTLCache(maxsize=10000, ttl=300)
+_profile_cache_lock = threading.Lock()
+
+
+def format_display_name(user: Optional[Dict[str, Any]], default: str = 'Unknown Creator') -> str:
+    """
+    Build a display name from a user_info row
+
+    Prefers "first last", falls back to the email, then to `default`.
+    """
+    if not user:
+        return default
+
+    first_name = (user.get('first_name') or '').strip()
+    last_name = (user.get('last_name') or '').strip()
+    email = (user.get('email') or '').strip()
+
+    if first_name or last_name:
+        return f"{first_name} {last_name}".strip()
+    if email:
+        return email
+    return default
+
+
+def invalidate_user(user_id: str) -> None:
+    """
+    Drop a user's cached profile, e.g. after they update it
+    """
+    with _profile_cache_lock:
+        _profile_cache.pop(user_id, None)
+
+
+class UserDirectory:
+    def __init__(self, supabase_client: Client):
+        self.supabase = supabase_client
+
+    def get_profiles(self, user_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve user_info rows for many users, querying only cache misses
+
+        Args:
+            user_ids (iterable): IDs of the users to resolve
+
+        Returns:
+            dict: user_info row (or None if missing) keyed by user id
+        """
+        user_ids = {user_id for user_id in user_ids if user_id}
+        profiles = {}
+        missing = []
+
+        with _profile_cache_lock:
+            for user_id in user_ids:
+                if user_id in _profile_cache:
+                    profiles[user_id] = _profile_cache[user_id]
+                else:
+                    missing.append(user_id)
+
+        if missing:
+            fetched = {user_id: None for user_id in missing}
+            for chunk in chunked(missing, ID_CHUNK_SIZE):
+                response = (
+                    self.supabase.table('user_info')
+                    .select('id, first_name, last_name, email')
+                    .in_('id', chunk)
+                    .execute()
+                )
+                for user in response.data or []:
+                    fetched[user['id']] = user
+
+            with _profile_cache_lock:
+                _profile_cache.update(fetched)
+            profiles.update(fetched)
+
+        return profiles
+
+    def get_display_names(self, user_ids: Iterable[str], default: str = 'Unknown Creator') -> Dict[str, str]:
+        """
+        Resolve display names for many users in one batched lookup
+        """
+        profiles = self.get_profiles(user_ids)
+        return {
+            user_id: format_display_name(profile, default)
+            for user_id, profile in profiles.items()
+        }
+
+    def get_display_name(self, user_id: str, default: str = 'Unknown Creator') -> str:
+        """
+        Resolve the display name for a single user
+        """
+        if not user_id:
+            return default
+        return self.get_display_names([user_id], default).get(user_id, default)
@@ -0,0 +1,329 @@
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+import httpx
+import jwt
+import streamlit as st
+
+# Sessions are refreshed in the background once their access token is
+# this close to expiring
+REFRESH_MARGIN_SECONDS = 300
+
+# Tolerated clock difference between this server and the auth server
+CLOCK_SKEW_SECONDS = 30
+
+# Seconds a rerun waits for an in-flight refresh of an expired token
+REFRESH_WAIT_SECONDS = 10
+
+# Audience of access tokens issued to signed-in users
+TOKEN_AUDIENCE = 'authenticated'
+
+# Asymmetric algorithms verified against the project's published JWKS
+ASYMMETRIC_ALGORITHMS = ('RS256', 'ES256')
+
+# How long fetched signing keys are reused; a token with an unknown key id
+# triggers an earlier refetch, at most once per JWKS_MIN_REFETCH_SECONDS
+JWKS_CACHE_SECONDS = 600
+JWKS_MIN_REFETCH_SECONDS = 60
+JWKS_TIMEOUT_SECONDS = 5
+
+# Background refreshes for all sessions share a small pool
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='auth-refresh')
+
+_jwt_secret = None
+_jwt_secret_loaded = False
+_jwt_secret_lock = threading.Lock()
+
+# Project signing keys by key id, fetched from the auth server's JWKS
+_jwks = None
+_jwks_fetched_at = None
+_jwks_lock = threading.Lock()
+
+
+def get_jwt_secret() -> Optional[bytes]:
+    """
+    Return the project's JWT secret from st.secrets, read once per process
+
+    Without SUPABASE_JWT_SECRET, HS256 tokens can not be verified locally
+    and are checked with the auth server instead.
+    """
+    global _jwt_secret, _jwt_secret_loaded
+
+    if not _jwt_secret_loaded:
+        with _jwt_secret_lock:
+            if not _jwt_secret_loaded:
+                secret = st.secrets.get('SUPABASE_JWT_SECRET')
+                _jwt_secret = secret.encode('utf-8') if secret else None
+                _jwt_secret_loaded = True
+    return _jwt_secret
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+def _fetch_jwks() -> Dict[str, Any]:
+    """
+    Load the project's public signing keys, skipping keys that can not be used
+
+    RS256 and ES256 keys need the `cryptography` package; without it they
+    are skipped and such tokens are checked with the auth server.
+    """
+    url = f"{st.secrets['SUPABASE_URL'].rstrip('/')}/auth/v1/.well-known/jwks.json"
+    response = httpx.get(url, timeout=JWKS_TIMEOUT_SECONDS)
+    response.raise_for_status()
+
+    keys = {}
+    for key in response.json().get('keys') or []:
+        try:
+            keys[key['kid']] = jwt.PyJWK(key)
+        except (KeyError, jwt.PyJWKError) as e:
+            print(f"Skipping signing key {key.get('kid')}: {e}")
+    return keys
+
+
+def get_signing_key(kid: Optional[str]):
+    """
+    Return the project's public signing key with the given id, or None
+
+    Keys are cached process-wide for JWKS_CACHE_SECONDS.
+    """
+    global _jwks, _jwks_fetched_at
+
+    with _jwks_lock:
+        age = None if _jwks_fetched_at is None else time.monotonic() - _jwks_fetched_at
+        if (
+            age is None
+            or age >= JWKS_CACHE_SECONDS
+            or (kid not in (_jwks or {}) and age >= JWKS_MIN_REFETCH_SECONDS)
+        ):
+            try:
+                _jwks = _fetch_jwks()
+            except Exception as e:
+                print(f"Error fetching signing keys: {e}")
+            _jwks_fetched_at = time.monotonic()
+        return (_jwks or {}).get(kid)
+
+
+def _decode(token: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], bytes, bytes]]:
+    """
+    Split a JWT into its header, claims, signing input and signature, unverified
+    """
+    try:
+        header_segment, payload_segment, signature_segment = token.split('.')
+        header = json.loads(_b64url_decode(header_segment))
+        claims = json.loads(_b64url_decode(payload_segment))
+        signature = _b64url_decode(signature_segment)
+    except (AttributeError, ValueError):
+        return None
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        return None
+    return header, claims, f"{header_segment}.{payload_segment}".encode('ascii'), signature
+
+
+def _unexpired(claims: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """
+    Whether a token's exp lies ahead, treating it as expired CLOCK_SKEW_SECONDS early
+    """
+    expires_at = claims.get('exp')
+    if not isinstance(expires_at, (int, float)):
+        return False
+    return expires_at - CLOCK_SKEW_SECONDS > (time.time() if now is None else now)
+
+
+def _for_signed_in_user(claims: Dict[str, Any]) -> bool:
+    """
+    Whether a token was issued to a signed-in user rather than, e.g., the anon or service key
+    """
+    audience = claims.get('aud')
+    audiences = audience if isinstance(audience, list) else [audience]
+    return TOKEN_AUDIENCE in audiences
+
+
+def verify_access_token(token: str, secret: Optional[bytes] = None, now: Optional[float] = None,
+                        signing_key=None) -> Optional[Dict[str, Any]]:
+    """
+    Verify a Supabase access token locally
+
+    Fails closed: a token whose signature can not be checked with the
+    given key is rejected.
+
+    Args:
+        token (str): Encoded JWT
+        secret (bytes, optional): Signing secret for HS256 tokens
+        now (float, optional): Current time, defaults to time.time()
+        signing_key (jwt.PyJWK, optional): Public key for RS256/ES256 tokens
+
+    Returns:
+        dict: The token's claims, or None if it is malformed, not
+              verifiable, wrongly signed, expired or not issued to a
+              signed-in user
+    """
+    decoded = _decode(token)
+    if decoded is None:
+        return None
+    header, claims, signing_input, signature = decoded
+    alg = header.get('alg')
+
+    if alg == 'HS256':
+        if secret is None:
+            return None
+        expected = hmac.new(secret, signing_input, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, signature):
+            return None
+    elif alg in ASYMMETRIC_ALGORITHMS:
+        if signing_key is None or signing_key.algorithm_name != alg:
+            return None
+        try:
+            if not signing_key.Algorithm.verify(signing_input, signing_key.key, signature):
+                return None
+        except Exception:
+            return None
+    else:
+        return None
+
+    if not _unexpired(claims, now) or not _for_signed_in_user(claims):
+        return None
+    return claims
+
+
+def _server_claims(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Claims of a token the auth server confirms belongs to a live user
+
+    Used when the token can not be verified locally.
+    """
+    decoded = _decode(token)
+    if decoded is None or not _unexpired(decoded[1]) or not _for_signed_in_user(decoded[1]):
+        return None
+    claims = decoded[1]
+
+    # Imported here: supabase_client builds on this module
+    from src.config.supabase_client import create_auth_client
+
+    try:
+        response = create_auth_client().auth.get_user(token)
+    except Exception as e:
+        print(f"Error verifying session with the auth server: {e}")
+        return None
+    if response is None or response.user is None or response.user.id != claims.get('sub'):
+        return None
+    return claims
+
+
+def _refresh(refresh_token: str):
+    """
+    Exchange a refresh token for a new session on a dedicated auth client
+    """
+    # Imported here: supabase_client builds on this module
+    from src.config.supabase_client import create_auth_client
+
+    return create_auth_client().auth.refresh_session(refresh_token).session
+
+
+def _session_claims(session) -> Optional[Dict[str, Any]]:
+    """
+    Claims of the session's access token, verified once per token
+    """
+    token = session.access_token
+    cached = st.session_state.get('auth_verified_token')
+    if cached and cached[0] == token:
+        claims = cached[1]
+        return claims if _unexpired(claims) else None
+
+    decoded = _decode(token)
+    header = decoded[0] if decoded else {}
+    secret = get_jwt_secret()
+    signing_key = None
+    if header.get('alg') in ASYMMETRIC_ALGORITHMS:
+        signing_key = get_signing_key(header.get('kid'))
+
+    if header.get('alg') == 'HS256' and secret is not None:
+        claims = verify_access_token(token, secret)
+    elif signing_key is not None:
+        claims = verify_access_token(token, signing_key=signing_key)
+    else:
+        # No local key for this token: the auth server has to vouch for it
+        claims = _server_claims(token)
+
+    if claims is not None:
+        st.session_state.auth_verified_token = (session.access_token, claims)
+    return claims
+
+
+def _adopt(session) -> None:
+    st.session_state.supabase_session = session
+    st.session_state.pop('auth_verified_token', None)
+
+
+def clear_auth_state() -> None:
+    """
+    Forget the session and any refresh in flight, e.g. on sign out
+    """
+    for key in ('supabase_session', 'auth_verified_token', 'auth_refresh'):
+        st.session_state.pop(key, None)
+
+
+def current_session():
+    """
+    Return the signed-in session from memory, refreshing it when needed
+
+    The access token is verified locally, so a steady-state rerun makes
+    no auth-server calls. Within REFRESH_MARGIN_SECONDS of expiry a
+    refresh is started in the background and adopted on a later rerun;
+    only an already expired token is refreshed in the foreground.
+
+    Returns:
+        Session or None if no valid session exists
+    """
+    session = st.session_state.get('supabase_session')
+    if session is None or not getattr(session, 'access_token', None):
+        return None
+
+    # Swap in a session refreshed in the background
+    pending = st.session_state.get('auth_refresh')
+    if pending is not None and pending.done():
+        st.session_state.pop('auth_refresh', None)
+        try:
+            refreshed = pending.result()
+        except Exception as e:
+            print(f"Error refreshing session: {e}")
+            refreshed = None
+        if refreshed is not None:
+            _adopt(refreshed)
+            session = refreshed
+        pending = None
+
+    claims = _session_claims(session)
+
+    if claims is None:
+        # Expired or invalid: wait for a refresh already in flight, or
+        # refresh now, since a refresh token can only be used once
+        try:
+            if pending is not None:
+                refreshed = pending.result(timeout=REFRESH_WAIT_SECONDS)
+            else:
+                refreshed = _refresh(session.refresh_token)
+        except Exception as e:
+            print(f"Error refreshing session: {e}")
+            refreshed = None
+
+        st.session_state.pop('auth_refresh', None)
+        if refreshed is not None:
+            _adopt(refreshed)
+        if refreshed is None or _session_claims(refreshed) is None:
+            clear_auth_state()
+            st.session_state.logged_in = False
+            return None
+        return refreshed
+
+    if pending is None and claims['exp'] - time.time() < REFRESH_MARGIN_SECONDS:
+        st.session_state.auth_refresh = _refresh_executor.submit(_refresh, session.refresh_token)
+
+    return session
+
@@ -0,0 +1,178 @@
+import contextvars
+import functools
+import threading
+import time
+from typing import Callable
+from prometheus_client import Counter, Histogram, start_http_server
+
+# Default port and address for the local metrics endpoint; override with
+# the METRICS_PORT / METRICS_ADDR secrets, METRICS_PORT = 0 disables it
+DEFAULT_METRICS_PORT = 9464
+DEFAULT_METRICS_ADDR = '127.0.0.1'
+
+# Page label for queries made outside a page render (background flushes,
+# session refreshes)
+NO_PAGE = 'none'
+
+QUERY_LATENCY = Histogram(
+    'flockiq_supabase_query_seconds',
+    'Latency of Supabase table and RPC requests',
+    ['table', 'operation', 'page'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+QUERY_ROWS = Counter(
+    'flockiq_supabase_query_rows_total',
+    'Rows returned by Supabase requests',
+    ['table', 'operation', 'page']
+)
+QUERY_BYTES = Counter(
+    'flockiq_supabase_query_response_bytes_total',
+    'Response payload bytes received from Supabase',
+    ['table', 'operation', 'page']
+)
+QUERY_ERRORS = Counter(
+    'flockiq_supabase_query_errors_total',
+    'Supabase requests that raised an error',
+    ['table', 'operation', 'page']
+)
+PAGE_RENDER_LATENCY = Histogram(
+    'flockiq_page_render_seconds',
+    'Time spent rendering a page, including its backend requests',
+    ['page'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+PAGE_RENDER_ERRORS = Counter(
+    'flockiq_page_render_errors_total',
+    'Page renders that raised an error',
+    ['page']
+)
+
+# Page currently being rendered in this context
+_current_page = contextvars.ContextVar('flockiq_current_page', default=NO_PAGE)
+
+# Size of the last response received in this context, set by the httpx hook
+_last_response_bytes = contextvars.ContextVar('flockiq_last_response_bytes', default=None)
+
+_server_started = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = DEFAULT_METRICS_PORT, addr: str = DEFAULT_METRICS_ADDR) -> bool:
+    """
+    Expose the metrics endpoint, once per process
+
+    Args:
+        port (int): Port to listen on; 0 or None disables the endpoint
+        addr (str): Address to bind, local-only by default
+
+    Returns:
+        bool: Whether the endpoint is running
+    """
+    global _server_started
+
+    if not port:
+        return False
+    if not _server_started:
+        with _server_lock:
+            if not _server_started:
+                try:
+                    start_http_server(int(port), addr=addr)
+                    _server_started = True
+                except OSError as e:
+                    print(f"Error starting metrics server on {addr}:{port}: {e}")
+    return _server_started
+
+
+def record_response_size(response) -> None:
+    """
+    httpx response hook that notes the payload size for the running query
+    """
+    response.read()
+    _last_response_bytes.set(len(response.content))
+
+
+def watch_response_sizes(http_client) -> None:
+    """
+    Install record_response_size on an httpx client, once
+    """
+    hooks = http_client.event_hooks['response']
+    if record_response_size not in hooks:
+        hooks.append(record_response_size)
+
+
+def row_count(data) -> int:
+    if isinstance(data, list):
+        return len(data)
+    return int(data is not None)
+
+
+def observe_query(table: str, operation: str, execute: Callable):
+    """
+    Run a query's execute() and record its latency, rows, bytes and errors
+
+    Args:
+        table (str): Table or RPC function name
+        operation (str): select, insert, upsert, update, delete or rpc
+        execute (Callable): The request builder's execute method
+
+    Returns:
+        The query's response
+    """
+    labels = (table, operation, _current_page.get())
+    _last_response_bytes.set(None)
+    start = time.perf_counter()
+    try:
+        result = execute()
+    except Exception:
+        QUERY_ERRORS.labels(*labels).inc()
+        raise
+    finally:
+        QUERY_LATENCY.labels(*labels).observe(time.perf_counter() - start)
+
+    QUERY_ROWS.labels(*labels).inc(row_count(getattr(result, 'data', None)))
+    response_bytes = _last_response_bytes.get()
+    if response_bytes is not None:
+        QUERY_BYTES.labels(*labels).inc(response_bytes)
+    return result
+
+
+def instrument_page(page: str, render: Callable) -> Callable:
+    """
+    Wrap a page render function to time it and label its queries with the page
+
+    st.rerun() and st.stop() raise BaseException subclasses, so they are
+    not counted as errors.
+    """
+    def instrumented(*args, **kwargs):
+        token = _current_page.set(page)
+        start = time.perf_counter()
+        try:
+            return render(*args, **kwargs)
+        except Exception:
+            PAGE_RENDER_ERRORS.labels(page).inc()
+            raise
+        finally:
+            PAGE_RENDER_LATENCY.labels(page).observe(time.perf_counter() - start)
+            _current_page.reset(token)
+
+    return instrumented
+
+
+def instrument_fragment(render: Callable) -> Callable:
+    """
+    Wrap a fragment function so its reruns are labelled with the current page
+
+    A fragment rerun only runs the fragment, not the page's instrumented
+    render, so the page is captured when the fragment is defined.
+    """
+    page = _current_page.get()
+
+    @functools.wraps(render)
+    def instrumented(*args, **kwargs):
+        token = _current_page.set(page)
+        try:
+            return render(*args, **kwargs)
+        finally:
+            _current_page.reset(token)
+
+    return instrumented
@@ -0,0 +1,15 @@
+-- Link responses to the user who submitted them so "My Responses" can
+-- filter by respondent instead of scanning every response.
+-- Anonymous responses keep respondent_id null.
+
+alter table public.responses
+    add column if not exists respondent_id uuid references auth.users (id);
+
+-- Serves the keyset-paginated "My Responses" query
+create index if not exists responses_respondent_created_at_idx
+    on public.responses (respondent_id, created_at desc, id desc);
+
+create policy "Users can view their own responses"
+    on public.responses
+    for select
+    using (auth.uid() = respondent_id);
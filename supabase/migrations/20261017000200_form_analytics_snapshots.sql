@@ -0,0 +1,54 @@
+-- Persisted per-form analytics aggregates.
+-- aggregates holds per-day buckets (response counts, hourly counts,
+-- option counts, numeric count/sum/min/max and per-value counts).
+--
+-- Refreshes are incremental on the id of the transaction that inserted
+-- each response. Every transaction below the xmin of a snapshot has
+-- finished, so once the rows with inserted_xid below that xmin are folded
+-- in, no later commit can add to that range. watermark_xid is the xmin
+-- the snapshot was last refreshed up to. Timestamps or sequence values
+-- can not serve as the watermark: both are assigned before commit, so a
+-- slow transaction can commit rows below a watermark that has already
+-- moved past them.
+
+alter table public.responses
+    add column if not exists inserted_xid xid8 not null default pg_current_xact_id();
+
+create table if not exists public.form_analytics_snapshots (
+    form_id uuid primary key references public.forms (id) on delete cascade,
+    watermark_xid xid8,
+    aggregates jsonb not null default '{"daily": {}}'::jsonb,
+    updated_at timestamp with time zone not null default now()
+);
+
+alter table public.form_analytics_snapshots enable row level security;
+
+create policy "Creators can manage snapshots of their forms"
+    on public.form_analytics_snapshots
+    for all
+    using (exists (
+        select 1 from public.forms f
+        where f.id = form_analytics_snapshots.form_id and f.creator_id = auth.uid()
+    ))
+    with check (exists (
+        select 1 from public.forms f
+        where f.id = form_analytics_snapshots.form_id and f.creator_id = auth.uid()
+    ));
+
+-- Upper bound for a refresh: every transaction below it has finished
+create or replace function public.responses_snapshot_xmin()
+returns text
+language sql
+stable
+security invoker
+as $$
+    select pg_snapshot_xmin(pg_current_snapshot())::text;
+$$;
+
+-- Serves the watermark scan: responses of one form in (inserted_xid, id) order
+create index if not exists responses_form_inserted_xid_idx
+    on public.responses (form_id, inserted_xid, id);
+
+-- Serves keyset pages of one form's responses in (created_at, id) order
+create index if not exists responses_form_created_at_idx
+    on public.responses (form_id, created_at, id);
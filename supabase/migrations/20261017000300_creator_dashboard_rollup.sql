@@ -0,0 +1,83 @@
+-- Cross-form rollups for the Forms Dashboard, computed with grouped
+-- queries in a single call:
+--   forms            per-form response counts and last response time
+--   monthly          responses per calendar month (all time)
+--   daily            responses per day over the last 30 days
+--   recent_activity  latest responses and form creations
+-- Always computed for the calling user (auth.uid()), so a creator can
+-- only ever read their own rollup.
+
+create or replace function public.creator_dashboard_rollup()
+returns jsonb
+language sql
+stable
+security invoker
+as $$
+    with creator_forms as (
+        select id, created_at, is_public
+        from public.forms
+        where creator_id = auth.uid()
+    ),
+    creator_responses as (
+        select r.id, r.form_id, r.created_at
+        from public.responses r
+        join creator_forms f on f.id = r.form_id
+    ),
+    form_counts as (
+        select
+            f.id as form_id,
+            f.created_at,
+            f.is_public,
+            count(r.id) as responses,
+            max(r.created_at) as last_response
+        from creator_forms f
+        left join creator_responses r on r.form_id = f.id
+        group by f.id, f.created_at, f.is_public
+    ),
+    monthly as (
+        select date_trunc('month', created_at) as month, count(*) as responses
+        from creator_responses
+        group by 1
+    ),
+    daily as (
+        select date_trunc('day', created_at) as day, count(*) as responses
+        from creator_responses
+        where created_at >= now() - interval '30 days'
+        group by 1
+    ),
+    recent_activity as (
+        (
+            select created_at as time, 'New response received' as action, form_id
+            from creator_responses
+            order by created_at desc
+            limit 10
+        )
+        union all
+        (
+            select created_at as time, 'Form created' as action, id as form_id
+            from creator_forms
+            order by created_at desc
+            limit 10
+        )
+    )
+    select jsonb_build_object(
+        'forms', coalesce((
+            select jsonb_agg(to_jsonb(fc) order by fc.created_at desc) from form_counts fc
+        ), '[]'::jsonb),
+        'monthly', coalesce((
+            select jsonb_agg(jsonb_build_object('month', month, 'responses', responses) order by month)
+            from monthly
+        ), '[]'::jsonb),
+        'daily', coalesce((
+            select jsonb_agg(jsonb_build_object('day', day, 'responses', responses) order by day)
+            from daily
+        ), '[]'::jsonb),
+        'recent_activity', coalesce((
+            select jsonb_agg(to_jsonb(a) order by a.time desc)
+            from (select * from recent_activity order by time desc limit 10) a
+        ), '[]'::jsonb)
+    );
+$$;
+
+-- Serves the per-creator form scan
+create index if not exists forms_creator_id_idx on public.forms (creator_id);
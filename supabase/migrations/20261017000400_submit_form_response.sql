@@ -0,0 +1,41 @@
+-- Atomically store one form submission.
+-- payload: {
+--   "form_id": uuid,
+--   "is_anon": boolean,
+--   "respondent_id": uuid | null,
+--   "answers": [{"question_id": uuid, "answer_value": text | null,
+--                "checkbox_value": [text] | null}, ...]
+-- }
+-- The response row and all of its answers are inserted in the same
+-- transaction; if any answer fails, nothing is stored.
+
+create or replace function public.submit_form_response(payload jsonb)
+returns uuid
+language plpgsql
+security invoker
+as $$
+declare
+    v_response_id uuid;
+begin
+    insert into public.responses (form_id, is_anon, respondent_id)
+    values (
+        (payload->>'form_id')::uuid,
+        coalesce((payload->>'is_anon')::boolean, false),
+        (payload->>'respondent_id')::uuid
+    )
+    returning id into v_response_id;
+
+    insert into public.response_answers (response_id, question_id, answer_value, checkbox_value)
+    select
+        v_response_id,
+        (answer->>'question_id')::uuid,
+        answer->>'answer_value',
+        case
+            when jsonb_typeof(answer->'checkbox_value') = 'array'
+                then array(select jsonb_array_elements_text(answer->'checkbox_value'))
+        end
+    from jsonb_array_elements(coalesce(payload->'answers', '[]'::jsonb)) as answer;
+
+    return v_response_id;
+end;
+$$;
@@ -0,0 +1,42 @@
+-- Bulk, idempotent variant of submit_form_response used by the
+-- write-behind submission queue.
+-- payloads: array of submit_form_response payloads, each with a
+-- client-generated "response_id". Responses whose id already exists are
+-- skipped together with their answers, so a batch can be replayed safely
+-- after a crash or a lost acknowledgement.
+
+create or replace function public.submit_form_responses(payloads jsonb)
+returns void
+language plpgsql
+security invoker
+as $$
+begin
+    with incoming as (
+        select payload
+        from jsonb_array_elements(coalesce(payloads, '[]'::jsonb)) as payload
+    ),
+    inserted as (
+        insert into public.responses (id, form_id, is_anon, respondent_id)
+        select
+            (payload->>'response_id')::uuid,
+            (payload->>'form_id')::uuid,
+            coalesce((payload->>'is_anon')::boolean, false),
+            (payload->>'respondent_id')::uuid
+        from incoming
+        on conflict (id) do nothing
+        returning id
+    )
+    insert into public.response_answers (response_id, question_id, answer_value, checkbox_value)
+    select
+        inserted.id,
+        (answer->>'question_id')::uuid,
+        answer->>'answer_value',
+        case
+            when jsonb_typeof(answer->'checkbox_value') = 'array'
+                then array(select jsonb_array_elements_text(answer->'checkbox_value'))
+        end
+    from inserted
+    join incoming on (incoming.payload->>'response_id')::uuid = inserted.id
+    cross join lateral jsonb_array_elements(coalesce(incoming.payload->'answers', '[]'::jsonb)) as answer;
+end;
+$$;
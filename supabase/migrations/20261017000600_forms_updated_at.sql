@@ -0,0 +1,66 @@
+-- Keep forms.updated_at current so cached form schemas can be
+-- revalidated with a single lookup. Any change to a form row or to
+-- one of its questions bumps the form's updated_at.
+
+create or replace function public.touch_form_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists forms_touch_updated_at on public.forms;
+create trigger forms_touch_updated_at
+    before update on public.forms
+    for each row execute function public.touch_form_updated_at();
+
+-- Statement-level, so a bulk insert/update/delete of questions touches
+-- each affected form once. Transition tables allow one event per
+-- trigger, hence one trigger per event sharing this function.
+create or replace function public.touch_form_of_question()
+returns trigger
+language plpgsql
+as $$
+begin
+    if tg_op = 'INSERT' then
+        update public.forms
+        set updated_at = now()
+        where id in (select distinct form_id from new_questions);
+    elsif tg_op = 'UPDATE' then
+        update public.forms
+        set updated_at = now()
+        where id in (
+            select form_id from new_questions
+            union
+            select form_id from old_questions
+        );
+    else
+        update public.forms
+        set updated_at = now()
+        where id in (select distinct form_id from old_questions);
+    end if;
+    return null;
+end;
+$$;
+
+drop trigger if exists questions_touch_form on public.questions;
+drop trigger if exists questions_touch_form_insert on public.questions;
+create trigger questions_touch_form_insert
+    after insert on public.questions
+    referencing new table as new_questions
+    for each statement execute function public.touch_form_of_question();
+
+drop trigger if exists questions_touch_form_update on public.questions;
+create trigger questions_touch_form_update
+    after update on public.questions
+    referencing old table as old_questions new table as new_questions
+    for each statement execute function public.touch_form_of_question();
+
+drop trigger if exists questions_touch_form_delete on public.questions;
+create trigger questions_touch_form_delete
+    after delete on public.questions
+    referencing old table as old_questions
+    for each statement execute function public.touch_form_of_question();
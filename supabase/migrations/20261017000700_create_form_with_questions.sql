@@ -0,0 +1,68 @@
+-- Append a chunk of questions to a form, numbering them from start_order.
+-- Used by create_form_with_questions and by clients that send very large
+-- question sets in several chunks. Returns the inserted questions rows.
+
+create or replace function public.append_form_questions(p_form_id uuid, questions jsonb, start_order integer)
+returns jsonb
+language plpgsql
+security invoker
+as $$
+declare
+    v_questions jsonb;
+begin
+    with inserted as (
+        insert into public.questions (form_id, questions_text, question_type, is_required, order_number, options)
+        select
+            p_form_id,
+            question->>'questions_text',
+            question->>'question_type',
+            coalesce((question->>'is_required')::boolean, false),
+            start_order + ordinality - 1,
+            case
+                when jsonb_typeof(question->'options') = 'array'
+                    then array(select jsonb_array_elements_text(question->'options'))
+            end
+        from jsonb_array_elements(coalesce(questions, '[]'::jsonb)) with ordinality as q(question, ordinality)
+        returning *
+    )
+    select coalesce(jsonb_agg(to_jsonb(inserted) order by inserted.order_number), '[]'::jsonb)
+    into v_questions
+    from inserted;
+
+    return v_questions;
+end;
+$$;
+
+-- Atomically create a form together with its questions.
+-- payload: {
+--   "creator_id": uuid,
+--   "is_public": boolean,
+--   "allow_anon": boolean,
+--   "questions": [{"questions_text": text, "question_type": text,
+--                  "is_required": boolean, "options": [text] | null}, ...]
+-- }
+-- Questions are numbered in array order starting at 1. Returns
+-- {"form": <forms row>, "questions": [<questions rows>]}.
+
+create or replace function public.create_form_with_questions(payload jsonb)
+returns jsonb
+language plpgsql
+security invoker
+as $$
+declare
+    v_form public.forms;
+begin
+    insert into public.forms (creator_id, is_public, allow_anon)
+    values (
+        (payload->>'creator_id')::uuid,
+        coalesce((payload->>'is_public')::boolean, false),
+        coalesce((payload->>'allow_anon')::boolean, false)
+    )
+    returning * into v_form;
+
+    return jsonb_build_object(
+        'form', to_jsonb(v_form),
+        'questions', public.append_form_questions(v_form.id, payload->'questions', 1)
+    );
+end;
+$$;
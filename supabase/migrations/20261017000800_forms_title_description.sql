@@ -0,0 +1,44 @@
+-- Store each form's title and description, so the published-forms
+-- search index can be built from the database in every process instead
+-- of only knowing them for forms created in the same process.
+
+alter table public.forms
+    add column if not exists title text,
+    add column if not exists description text;
+
+-- create_form_with_questions now also takes the form's title and
+-- description.
+-- payload: {
+--   "creator_id": uuid,
+--   "title": text,
+--   "description": text,
+--   "is_public": boolean,
+--   "allow_anon": boolean,
+--   "questions": [{"questions_text": text, "question_type": text,
+--                  "is_required": boolean, "options": [text] | null}, ...]
+-- }
+
+create or replace function public.create_form_with_questions(payload jsonb)
+returns jsonb
+language plpgsql
+security invoker
+as $$
+declare
+    v_form public.forms;
+begin
+    insert into public.forms (creator_id, title, description, is_public, allow_anon)
+    values (
+        (payload->>'creator_id')::uuid,
+        nullif(btrim(payload->>'title'), ''),
+        nullif(btrim(payload->>'description'), ''),
+        coalesce((payload->>'is_public')::boolean, false),
+        coalesce((payload->>'allow_anon')::boolean, false)
+    )
+    returning * into v_form;
+
+    return jsonb_build_object(
+        'form', to_jsonb(v_form),
+        'questions', public.append_form_questions(v_form.id, payload->'questions', 1)
+    );
+end;
+$$;
@@ -0,0 +1,35 @@
+-- submit_form_response trusted the payload's respondent_id, so any caller
+-- could attribute a response to another user. Non-anonymous responses are
+-- now linked to the caller (auth.uid()); the payload's respondent_id is
+-- ignored.
+
+create or replace function public.submit_form_response(payload jsonb)
+returns uuid
+language plpgsql
+security invoker
+as $$
+declare
+    v_response_id uuid;
+begin
+    insert into public.responses (form_id, is_anon, respondent_id)
+    values (
+        (payload->>'form_id')::uuid,
+        coalesce((payload->>'is_anon')::boolean, false),
+        case when coalesce((payload->>'is_anon')::boolean, false) then null else auth.uid() end
+    )
+    returning id into v_response_id;
+
+    insert into public.response_answers (response_id, question_id, answer_value, checkbox_value)
+    select
+        v_response_id,
+        (answer->>'question_id')::uuid,
+        answer->>'answer_value',
+        case
+            when jsonb_typeof(answer->'checkbox_value') = 'array'
+                then array(select jsonb_array_elements_text(answer->'checkbox_value'))
+        end
+    from jsonb_array_elements(coalesce(payload->'answers', '[]'::jsonb)) as answer;
+
+    return v_response_id;
+end;
+$$;
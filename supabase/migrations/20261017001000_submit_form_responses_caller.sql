@@ -0,0 +1,46 @@
+-- submit_form_responses trusted each payload's respondent_id, so any
+-- caller could attribute responses to another user. A payload's
+-- respondent_id now only asks for the response to be linked; it is always
+-- linked to the caller (auth.uid()), never to the id given. Payloads
+-- without one (queued anonymous-visitor submissions, CSV imports) stay
+-- unlinked rather than being attributed to whoever runs the import.
+
+create or replace function public.submit_form_responses(payloads jsonb)
+returns void
+language plpgsql
+security invoker
+as $$
+begin
+    with incoming as (
+        select payload
+        from jsonb_array_elements(coalesce(payloads, '[]'::jsonb)) as payload
+    ),
+    inserted as (
+        insert into public.responses (id, form_id, is_anon, respondent_id)
+        select
+            (payload->>'response_id')::uuid,
+            (payload->>'form_id')::uuid,
+            coalesce((payload->>'is_anon')::boolean, false),
+            case
+                when coalesce((payload->>'is_anon')::boolean, false)
+                    or payload->>'respondent_id' is null then null
+                else auth.uid()
+            end
+        from incoming
+        on conflict (id) do nothing
+        returning id
+    )
+    insert into public.response_answers (response_id, question_id, answer_value, checkbox_value)
+    select
+        inserted.id,
+        (answer->>'question_id')::uuid,
+        answer->>'answer_value',
+        case
+            when jsonb_typeof(answer->'checkbox_value') = 'array'
+                then array(select jsonb_array_elements_text(answer->'checkbox_value'))
+        end
+    from inserted
+    join incoming on (incoming.payload->>'response_id')::uuid = inserted.id
+    cross join lateral jsonb_array_elements(coalesce(incoming.payload->'answers', '[]'::jsonb)) as answer;
+end;
+$$;
@@ -0,0 +1,51 @@
+-- Let submit_form_responses keep the original submission time of
+-- imported responses. A payload's "created_at" is only honoured when the
+-- caller created the form, so respondents can not backdate their own
+-- submissions; everyone else's responses are timestamped now().
+
+create or replace function public.submit_form_responses(payloads jsonb)
+returns void
+language plpgsql
+security invoker
+as $$
+begin
+    with incoming as (
+        select payload
+        from jsonb_array_elements(coalesce(payloads, '[]'::jsonb)) as payload
+    ),
+    inserted as (
+        insert into public.responses (id, form_id, is_anon, respondent_id, created_at)
+        select
+            (payload->>'response_id')::uuid,
+            (payload->>'form_id')::uuid,
+            coalesce((payload->>'is_anon')::boolean, false),
+            case
+                when coalesce((payload->>'is_anon')::boolean, false)
+                    or payload->>'respondent_id' is null then null
+                else auth.uid()
+            end,
+            case
+                when payload->>'created_at' is not null and exists (
+                    select 1 from public.forms f
+                    where f.id = (payload->>'form_id')::uuid and f.creator_id = auth.uid()
+                ) then (payload->>'created_at')::timestamptz
+                else now()
+            end
+        from incoming
+        on conflict (id) do nothing
+        returning id
+    )
+    insert into public.response_answers (response_id, question_id, answer_value, checkbox_value)
+    select
+        inserted.id,
+        (answer->>'question_id')::uuid,
+        answer->>'answer_value',
+        case
+            when jsonb_typeof(answer->'checkbox_value') = 'array'
+                then array(select jsonb_array_elements_text(answer->'checkbox_value'))
+        end
+    from inserted
+    join incoming on (incoming.payload->>'response_id')::uuid = inserted.id
+    cross join lateral jsonb_array_elements(coalesce(incoming.payload->'answers', '[]'::jsonb)) as answer;
+end;
+$$;
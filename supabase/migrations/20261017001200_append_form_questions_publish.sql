@@ -0,0 +1,49 @@
+-- append_form_questions takes an optional p_is_public. When it is given,
+-- the form's visibility is set in the same transaction, so a form created
+-- in chunks is only published together with its last chunk and
+-- respondents never see a partial form.
+-- The three-argument version is dropped first; keeping it next to one
+-- with a defaulted fourth argument would make three-argument calls, like
+-- the one in create_form_with_questions, ambiguous.
+
+drop function if exists public.append_form_questions(uuid, jsonb, integer);
+
+create or replace function public.append_form_questions(
+    p_form_id uuid,
+    questions jsonb,
+    start_order integer,
+    p_is_public boolean default null
+)
+returns jsonb
+language plpgsql
+security invoker
+as $$
+declare
+    v_questions jsonb;
+begin
+    with inserted as (
+        insert into public.questions (form_id, questions_text, question_type, is_required, order_number, options)
+        select
+            p_form_id,
+            question->>'questions_text',
+            question->>'question_type',
+            coalesce((question->>'is_required')::boolean, false),
+            start_order + ordinality - 1,
+            case
+                when jsonb_typeof(question->'options') = 'array'
+                    then array(select jsonb_array_elements_text(question->'options'))
+            end
+        from jsonb_array_elements(coalesce(questions, '[]'::jsonb)) with ordinality as q(question, ordinality)
+        returning *
+    )
+    select coalesce(jsonb_agg(to_jsonb(inserted) order by inserted.order_number), '[]'::jsonb)
+    into v_questions
+    from inserted;
+
+    if p_is_public is not null then
+        update public.forms set is_public = p_is_public where id = p_form_id;
+    end if;
+
+    return v_questions;
+end;
+$$;
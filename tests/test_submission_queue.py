@@ -0,0 +1,209 @@
+import json
+import os
+import tempfile
+import unittest
+from postgrest.exceptions import APIError
+from src.services.submission_queue import (
+    DEAD_LETTER_FILE,
+    SubmissionQueue,
+    is_permanent_error
+)
+
+ANSWERS = [{'question_id': 'q1', 'answer_value': 'Yes'}]
+
+
+class FakeResponseService:
+    """
+    Stores bulk submissions in memory, skipping ids it already has
+
+    Submissions to forms in `poison` are rejected with a constraint
+    violation; while `down` is set every call fails like an outage.
+    """
+
+    def __init__(self):
+        self.stored = {}
+        self.poison = set()
+        self.down = False
+
+    def submit_responses_bulk(self, payloads):
+        if self.down:
+            raise ConnectionError("backend unavailable")
+        for payload in payloads:
+            if payload['form_id'] in self.poison:
+                raise APIError({'code': '23503', 'message': 'violates foreign key constraint'})
+        for payload in payloads:
+            self.stored.setdefault(payload['response_id'], payload)
+
+
+def segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith('segment-'))
+
+
+def crash(queue):
+    """
+    Drop a queue the way a killed process would: no flush, no cleanup
+    """
+    queue._segment.close()
+    queue._owner_lock.close()
+
+
+class SubmissionQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.service = FakeResponseService()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def dead_letters(self):
+        path = os.path.join(self.root, DEAD_LETTER_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r', encoding='utf-8') as fileobj:
+            return [json.loads(line) for line in fileobj]
+
+    def test_enqueue_is_durable_before_flush(self):
+        queue = SubmissionQueue(self.service, self.root)
+        response_id = queue.enqueue('form-1', ANSWERS)
+
+        with open(queue._segment_path, 'r', encoding='utf-8') as segment:
+            entries = [json.loads(line) for line in segment]
+        self.assertEqual([entry['response_id'] for entry in entries], [response_id])
+        self.assertEqual(self.service.stored, {})
+
+    def test_replay_after_crash(self):
+        first = SubmissionQueue(self.service, self.root)
+        ids = [first.enqueue('form-1', ANSWERS) for _ in range(3)]
+        crash(first)
+
+        second = SubmissionQueue(self.service, self.root)
+        self.assertEqual(second.backlog(), 3)
+        self.assertFalse(os.path.exists(first.wal_dir))
+
+        self.assertEqual(second.flush(), 3)
+        self.assertEqual(sorted(self.service.stored), sorted(ids))
+        self.assertEqual(len(segments(second.wal_dir)), 1)
+        self.assertEqual(second.backlog(), 0)
+
+    def test_replay_skips_torn_final_line(self):
+        first = SubmissionQueue(self.service, self.root)
+        response_id = first.enqueue('form-1', ANSWERS)
+        first._segment.write('{"form_id": "form-1", "resp')
+        first._segment.flush()
+        crash(first)
+
+        second = SubmissionQueue(self.service, self.root)
+        self.assertEqual(second.flush(), 1)
+        self.assertEqual(list(self.service.stored), [response_id])
+
+    def test_replay_twice_does_not_duplicate(self):
+        first = SubmissionQueue(self.service, self.root)
+        response_id = first.enqueue('form-1', ANSWERS)
+        # Stored, but the process dies before deleting the segment
+        self.service.submit_responses_bulk(list(first._pending))
+        crash(first)
+
+        second = SubmissionQueue(self.service, self.root)
+        second.flush()
+        self.assertEqual(list(self.service.stored), [response_id])
+
+    def test_live_process_directory_is_not_adopted(self):
+        live = SubmissionQueue(self.service, self.root)
+        live.enqueue('form-1', ANSWERS)
+
+        other = SubmissionQueue(self.service, self.root)
+        self.assertEqual(other.backlog(), 0)
+        self.assertEqual(len(segments(live.wal_dir)), 1)
+        self.assertEqual(live.backlog(), 1)
+
+    def test_partial_rejection_dead_letters_poison_entries(self):
+        queue = SubmissionQueue(self.service, self.root)
+        self.service.poison.add('deleted-form')
+        good = [queue.enqueue('form-1', ANSWERS) for _ in range(3)]
+        bad = queue.enqueue('deleted-form', ANSWERS)
+
+        self.assertEqual(queue.flush(), 4)
+        self.assertEqual(sorted(self.service.stored), sorted(good))
+        self.assertEqual([entry['payload']['response_id'] for entry in self.dead_letters()], [bad])
+        self.assertEqual(queue.backlog(), 0)
+
+    def test_single_poison_entry_does_not_block_the_wal(self):
+        queue = SubmissionQueue(self.service, self.root)
+        self.service.poison.add('deleted-form')
+        bad = queue.enqueue('deleted-form', ANSWERS)
+
+        self.assertEqual(queue.flush(), 1)
+        self.assertEqual(queue.backlog(), 0)
+        self.assertEqual([entry['payload']['response_id'] for entry in self.dead_letters()], [bad])
+
+        good = queue.enqueue('form-1', ANSWERS)
+        queue.flush()
+        self.assertEqual(list(self.service.stored), [good])
+
+    def test_outage_keeps_entries_and_segments(self):
+        queue = SubmissionQueue(self.service, self.root)
+        ids = [queue.enqueue('form-1', ANSWERS) for _ in range(2)]
+        self.service.down = True
+
+        with self.assertRaises(ConnectionError):
+            queue.flush()
+        self.assertEqual(queue.backlog(), 2)
+        self.assertEqual(self.dead_letters(), [])
+        # The sealed segment and the fresh active one
+        self.assertEqual(len(segments(queue.wal_dir)), 2)
+
+        self.service.down = False
+        queue.flush()
+        self.assertEqual(sorted(self.service.stored), sorted(ids))
+        self.assertEqual(len(segments(queue.wal_dir)), 1)
+
+    def test_flush_rotates_segments(self):
+        queue = SubmissionQueue(self.service, self.root, batch_size=2)
+        for _ in range(5):
+            queue.enqueue('form-1', ANSWERS)
+        sealed = queue._segment_path
+
+        queue.flush()
+        self.assertNotEqual(queue._segment_path, sealed)
+        self.assertFalse(os.path.exists(sealed))
+        self.assertEqual(len(self.service.stored), 5)
+
+        later = queue.enqueue('form-1', ANSWERS)
+        with open(queue._segment_path, 'r', encoding='utf-8') as segment:
+            self.assertEqual([json.loads(line)['response_id'] for line in segment], [later])
+
+    def test_stop_removes_drained_directory(self):
+        queue = SubmissionQueue(self.service, self.root).start()
+        queue.enqueue('form-1', ANSWERS)
+        queue.stop()
+
+        self.assertEqual(len(self.service.stored), 1)
+        self.assertFalse(os.path.exists(queue.wal_dir))
+
+    def test_stop_keeps_directory_with_unsent_entries(self):
+        self.service.down = True
+        queue = SubmissionQueue(self.service, self.root).start()
+        queue.enqueue('form-1', ANSWERS)
+        queue.stop()
+
+        self.assertTrue(os.path.exists(queue.wal_dir))
+        queue._owner_lock.close()
+        self.service.down = False
+        self.assertEqual(SubmissionQueue(self.service, self.root).flush(), 1)
+
+
+class IsPermanentErrorTest(unittest.TestCase):
+    def test_constraint_and_data_errors_are_permanent(self):
+        for code in ('23503', '23505', '22P02', '42501', 'PGRST102', 400, 413):
+            self.assertTrue(is_permanent_error(APIError({'code': code})), code)
+
+    def test_transport_and_server_errors_are_transient(self):
+        for code in ('08006', '57014', '42883', 'PGRST000', 'PGRST301', 429, 502, None):
+            self.assertFalse(is_permanent_error(APIError({'code': code})), code)
+        self.assertFalse(is_permanent_error(ConnectionError()))
+        self.assertFalse(is_permanent_error(TimeoutError()))
+
+
+if __name__ == '__main__':
+    unittest.main()